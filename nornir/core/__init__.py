@@ -1,11 +1,43 @@
+import asyncio
 import logging
 import logging.config
-from multiprocessing.dummy import Pool
+import math
+import os
+import threading
+import time
+import zlib
+from collections import Counter
+from collections.abc import MutableSequence
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Any, Callable, Iterator, List, Optional
 
+from nornir.core.cache import _task_id
 from nornir.core.configuration import Config
-from nornir.core.inventory import Inventory
+from nornir.core.durations import Durations
+from nornir.core.exceptions import NornirTimeoutError
+from nornir.core.inventory import Host, Hosts, Inventory
+from nornir.core.journal import Journal
+from nornir.core.pool import (
+    Autoscaler,
+    RunHandle,
+    WorkerPool,
+    _host_guard,
+    _process_pool,
+)
+from nornir.core.sink import ResultSummary
+from nornir.core.spill import _spill
 from nornir.core.state import GlobalState
-from nornir.core.task import AggregatedResult, Task
+from nornir.core.task import (
+    AggregatedResult,
+    MultiResult,
+    Result,
+    Task,
+    _attach_results,
+    _close_connections,
+    _copy_results,
+    _detach_results,
+    _intern_results,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,16 +52,29 @@ class Nornir(object):
         data(GlobalState): shared data amongst different iterations of nornir
         dry_run(``bool``): Whether if we are testing the changes or not
         config (:obj:`nornir.core.configuration.Config`): Configuration object
+        pool (:obj:`nornir.core.pool.WorkerPool`): Pool of worker threads to run tasks,
+          if not set a new one will be created
+        durations (:obj:`nornir.core.durations.Durations`): Store of how long hosts
+          take to run each task, if not set a new one will be created
 
     Attributes:
         inventory (:obj:`nornir.core.inventory.Inventory`): Inventory to work with
         data(:obj:`nornir.core.GlobalState`): shared data amongst different iterations of nornir
         dry_run(``bool``): Whether if we are testing the changes or not
         config (:obj:`nornir.core.configuration.Config`): Configuration parameters
+        pool (:obj:`nornir.core.pool.WorkerPool`): Pool of worker threads shared with
+          the objects returned by :meth:`filter`
+        durations (:obj:`nornir.core.durations.Durations`): Store of how long hosts
+          take to run each task, shared with the objects returned by :meth:`filter`
     """
 
     def __init__(
-        self, inventory: Inventory, config: Config = None, data: GlobalState = None
+        self,
+        inventory: Inventory,
+        config: Config = None,
+        data: GlobalState = None,
+        pool: WorkerPool = None,
+        durations: Durations = None,
     ) -> None:
         self.data = data if data is not None else GlobalState()
 
@@ -37,13 +82,23 @@ class Nornir(object):
 
         self.config = config or Config()
 
+        self.pool = pool or WorkerPool(
+            self.config.core.num_workers, self.config.core.num_processes
+        )
+
+        self.durations = (
+            durations
+            if durations is not None
+            else Durations(self.config.core.durations_file)
+        )
+
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close_connections(on_good=True, on_failed=True)
 
-    def filter(self, *args, **kwargs):
+    def filter(self, *args: Any, **kwargs: Any) -> "Nornir":
         """
         See :py:meth:`nornir.core.inventory.Inventory.filter`
 
@@ -54,26 +109,435 @@ class Nornir(object):
         b.inventory = self.inventory.filter(*args, **kwargs)
         return b
 
-    def _run_serial(self, task, hosts, **kwargs):
-        result = AggregatedResult(kwargs.get("name") or task.__name__)
+    def _start_task(self, task, host, **kwargs):
+        started = time.monotonic()
+        r = Task(task, **kwargs).start(host, self)
+        self.durations.record(r.name, host.name, time.monotonic() - started)
+        return self._spill_results(r)
+
+    def _spill_results(self, r):
+        threshold = self.config.core.spill_threshold
+        if threshold is not None:
+            _spill(r, threshold)
+        return r
+
+    def _iter_serial(self, task, hosts, **kwargs):
+        job = _host_guard.job() or object()
         for host in hosts:
-            result[host.name] = Task(task, **kwargs).start(host, self)
+            with _host_guard.hold(host, job):
+                r = self._start_task(task, host, **kwargs)
+            yield r
+
+    def _run_serial(self, task, hosts, on_result=None, **kwargs):
+        result = AggregatedResult(kwargs.get("name") or task.__name__)
+        for r in self._iter_serial(task, hosts, **kwargs):
+            result[r.host.name] = on_result(r) if on_result else r
         return result
 
-    def _run_parallel(self, task, hosts, num_workers, **kwargs):
+    def _run_parallel(self, task, hosts, num_workers, on_result=None, **kwargs):
         result = AggregatedResult(kwargs.get("name") or task.__name__)
+        results = {}
+        for r in self._run_hosts(task, hosts, num_workers, **kwargs):
+            results[r.host.name] = on_result(r) if on_result else r
+        for host in hosts:
+            result[host.name] = results[host.name]
+        if isinstance(num_workers, Autoscaler):
+            result.stats["num_workers"] = num_workers.num_workers
+            result.stats["num_workers_history"] = num_workers.history
+        return result
 
-        pool = Pool(processes=num_workers)
-        result_pool = [
-            pool.apply_async(Task(task, **kwargs).start, args=(h, self)) for h in hosts
-        ]
-        pool.close()
-        pool.join()
+    def _num_workers(self, num_workers, min_workers, max_workers):
+        num_workers = num_workers or self.config.core.num_workers
+        if num_workers == "auto":
+            return Autoscaler(
+                self.config.core.num_workers,
+                min_workers=min_workers,
+                max_workers=max_workers,
+            )
+        if not isinstance(num_workers, int):
+            raise ValueError(f"invalid num_workers: {num_workers!r}")
+        return num_workers
 
-        for rp in result_pool:
-            r = rp.get()
-            result[r.host.name] = r
-        return result
+    def _run_hosts(
+        self,
+        task,
+        hosts,
+        num_workers,
+        concurrency_limits=None,
+        task_timeout=None,
+        run_timeout=None,
+        batch_size=None,
+        batch_percent=None,
+        max_fail_percentage=None,
+        priority=None,
+        cancel_event=None,
+        depends_on=None,
+        **kwargs,
+    ):
+        name = kwargs.get("name") or task.__name__
+
+        scaler = num_workers if isinstance(num_workers, Autoscaler) else None
+
+        def start(host):
+            started = time.monotonic()
+            r = self._start_task(task, host, **kwargs)
+            if scaler:
+                scaler.observe(time.monotonic() - started, r.failed)
+            return r
+
+        if priority is None and (scaler or num_workers > 1):
+
+            def priority(host):
+                expected = self.durations.get(name, host.name)
+                return float("inf") if expected is None else expected
+
+        def timed_out(host, exc):
+            r = Result(host, exception=exc, result=str(exc), failed=True)
+            r.name = name
+            r.severity_level = logging.ERROR
+            results = MultiResult(name)
+            results.append(r)
+            return results
+
+        def skipped(host, reason):
+            r = Result(
+                host,
+                result=f"skipped, {reason}",
+                severity_level=logging.WARNING,
+                skipped=True,
+            )
+            r.name = name
+            results = MultiResult(name)
+            results.append(r)
+            return results
+
+        if batch_size and batch_percent:
+            raise ValueError("batch_size and batch_percent are mutually exclusive")
+        if depends_on and (batch_size or batch_percent):
+            raise ValueError("depends_on can't be used with batches")
+        dependencies = self._dependencies(hosts, depends_on) if depends_on else None
+        if batch_percent:
+            if not 0 < batch_percent <= 100:
+                raise ValueError("batch_percent must be between 0 and 100")
+            batch_size = max(1, math.ceil(len(hosts) * batch_percent / 100))
+        elif batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be greater than 0")
+        batch_size = batch_size or len(hosts) or 1
+
+        skip_reason = None
+
+        def stop():
+            nonlocal skip_reason
+            if skip_reason is None and cancel_event and cancel_event.is_set():
+                skip_reason = "run cancelled"
+            return skip_reason is not None
+
+        run_started = time.monotonic()
+        for i in range(0, len(hosts), batch_size):
+            batch = hosts[i : i + batch_size]
+            if priority is not None:
+                batch = sorted(batch, key=priority, reverse=True)
+            if stop():
+                for host in batch:
+                    yield skipped(host, skip_reason)
+                continue
+
+            failed = 0
+            done = set()
+            for r in self._dispatch(
+                start,
+                batch,
+                num_workers,
+                concurrency_limits=concurrency_limits,
+                task_timeout=task_timeout,
+                run_timeout=run_timeout,
+                run_started=run_started,
+                on_timeout=timed_out,
+                stop=stop,
+                dependencies=dependencies,
+                succeeded=lambda r: not r.failed,
+            ):
+                done.add(r.host.name)
+                failed += r.failed
+                if (
+                    skip_reason is None
+                    and max_fail_percentage is not None
+                    and failed * 100 > max_fail_percentage * len(batch)
+                ):
+                    logger.error(
+                        "Task %r: %d out of %d hosts failed in batch, "
+                        "skipping the remaining hosts",
+                        name,
+                        failed,
+                        len(batch),
+                    )
+                    skip_reason = "max_fail_percentage exceeded"
+                yield r
+            for host in batch:
+                if host.name not in done:
+                    yield skipped(host, skip_reason or "dependency failed")
+
+    def _dependencies(self, hosts, depends_on):
+        names = {h.name for h in hosts}
+        dependencies = {}
+        for host in hosts:
+            required = (
+                depends_on(host) if callable(depends_on) else host.get(depends_on)
+            )
+            if isinstance(required, str):
+                required = [required]
+            dependencies[host.name] = deps = set()
+            for dep in required or ():
+                if dep in self.inventory.groups:
+                    deps.update(h.name for h in self.inventory.children_of_group(dep))
+                else:
+                    deps.add(dep)
+            deps.intersection_update(names)
+            deps.discard(host.name)
+
+        visited = {}
+
+        def visit(name, path):
+            if visited.get(name) == "visiting":
+                cycle = path[path.index(name) :] + [name]
+                raise ValueError("dependency cycle: {}".format(" -> ".join(cycle)))
+            if name not in visited:
+                visited[name] = "visiting"
+                for dep in sorted(dependencies[name]):
+                    visit(dep, path + [name])
+                visited[name] = "done"
+
+        for name in dependencies:
+            visit(name, [])
+        return dependencies
+
+    def _dispatch(
+        self,
+        func,
+        hosts,
+        num_workers,
+        concurrency_limits=None,
+        task_timeout=None,
+        run_timeout=None,
+        run_started=None,
+        on_timeout=None,
+        stop=None,
+        dependencies=None,
+        succeeded=None,
+    ):
+        """
+        Run ``func(host)`` for each host on the shared pool, never having more than
+        ``num_workers`` hosts running at the same time, and yield what it returns
+        as hosts complete. ``num_workers`` can also be an :obj:`Autoscaler`, in
+        which case its current ``num_workers`` is used.
+
+        ``concurrency_limits`` maps host attributes to the maximum number of hosts
+        sharing the same value for that attribute that can run at the same time.
+        Lists, like ``groups``, are limited for each of their elements.
+        Hosts that would go over a limit are skipped in favour of the next one
+        that can run right away.
+
+        Hosts running for longer than ``task_timeout`` seconds, and all the hosts
+        not done ``run_timeout`` seconds after ``run_started`` (defaults to now),
+        are given up on: their connections are closed and ``on_timeout(host, exc)``
+        is yielded instead.
+
+        Once ``stop()`` returns ``True`` no more hosts are started, the hosts already
+        running are waited for and the ones that didn't start are not yielded.
+
+        Hosts being run by runs of other jobs at the same time are left for later,
+        see :obj:`nornir.core.pool.HostGuard`. When called from a worker of the
+        pool, like when a task starts a run, the worker lends its place in the pool
+        while waiting so the hosts of both runs can't starve each other.
+
+        ``dependencies`` maps host names to the names of the hosts that have to
+        complete before them. A host completes successfully unless
+        ``succeeded(result)`` returns ``False`` or it times out, otherwise the hosts
+        depending on it, directly or not, are not run nor yielded.
+        """
+        scaler = num_workers if isinstance(num_workers, Autoscaler) else None
+
+        def workers():
+            return scaler.num_workers if scaler else num_workers
+
+        max_workers = scaler.max_workers if scaler else num_workers
+        if max_workers > self.pool.num_workers:
+            self.pool.resize(max_workers)
+
+        limits = concurrency_limits or {}
+        for attr, limit in limits.items():
+            if limit < 1:
+                raise ValueError(
+                    f"concurrency limit for {attr!r} must be greater than 0"
+                )
+        keys = {}
+        for host in hosts:
+            keys[host.name] = [
+                (attr, value) for attr in limits for value in _limit_values(host, attr)
+            ]
+        in_use = Counter()
+
+        dependencies = dependencies or {}
+        finished = set()
+        failed = set()
+
+        def runnable(host):
+            return all(
+                in_use[k] < limits[k[0]] for k in keys[host.name]
+            ) and finished.issuperset(dependencies.get(host.name, ()))
+
+        run_started = run_started or time.monotonic()
+        run_deadline = run_started + run_timeout if run_timeout else None
+        started = {}
+
+        def next_deadline():
+            deadlines = [run_deadline] if run_deadline else []
+            if task_timeout and running:
+                deadlines.append(min(started[f] for f in running) + task_timeout)
+            return max(0, min(deadlines) - time.monotonic()) if deadlines else None
+
+        job = _host_guard.job() or object()
+        waiter = object()
+
+        def call(host):
+            with _host_guard.running(job):
+                return func(host)
+
+        pending = list(hosts)
+        running = {}
+        with self.pool.lend():
+            try:
+                while pending or running:
+                    i = 0
+                    released = set()
+                    _host_guard.done_waiting(waiter)
+                    while (
+                        i < len(pending)
+                        and len(running) < workers()
+                        and not (run_deadline and time.monotonic() >= run_deadline)
+                    ):
+                        if not runnable(pending[i]):
+                            i += 1
+                            continue
+                        busy = _host_guard.acquire(pending[i], job, waiter)
+                        if busy:
+                            released.add(busy)
+                            i += 1
+                            continue
+                        host = pending.pop(i)
+                        in_use.update(keys[host.name])
+                        future = self.pool.submit(call, host)
+                        running[future] = host
+                        started[future] = time.monotonic()
+                    done, _ = wait(
+                        list(running) + list(released),
+                        timeout=next_deadline(),
+                        return_when=FIRST_COMPLETED,
+                    )
+                    for future in done:
+                        if future not in running:
+                            continue
+                        del started[future]
+                        host = running.pop(future)
+                        in_use.subtract(keys[host.name])
+                        _host_guard.release(host, job)
+                        result = future.result()
+                        if succeeded is None or succeeded(result):
+                            finished.add(host.name)
+                        else:
+                            failed.add(host.name)
+                        yield result
+
+                    now = time.monotonic()
+                    if run_deadline and now >= run_deadline:
+                        expired = [f for f in running if not f.done()]
+                        for host in pending:
+                            exc = NornirTimeoutError(
+                                host.name, run_timeout, "run timed out before starting"
+                            )
+                            yield on_timeout(host, exc)
+                        pending = []
+                        msg, timeout = "run timed out", run_timeout
+                    elif task_timeout:
+                        expired = [
+                            f
+                            for f in running
+                            if now - started[f] >= task_timeout and not f.done()
+                        ]
+                        msg, timeout = "task timed out", task_timeout
+                    else:
+                        expired = []
+
+                    for future in expired:
+                        del started[future]
+                        host = running.pop(future)
+                        in_use.subtract(keys[host.name])
+                        logger.error("Host %r: %s after %ss", host.name, msg, timeout)
+                        self.pool.abandon(future)
+                        # closing may block as long as the host does, the host is
+                        # released once its connections are closed
+                        threading.Thread(
+                            target=_close_and_release,
+                            args=(host, job),
+                            name="nornir-close",
+                            daemon=True,
+                        ).start()
+                        failed.add(host.name)
+                        yield on_timeout(
+                            host, NornirTimeoutError(host.name, timeout, msg)
+                        )
+
+                    if stop and stop():
+                        pending = []
+                    while failed:
+                        doomed = [
+                            h
+                            for h in pending
+                            if failed & dependencies.get(h.name, set())
+                        ]
+                        if not doomed:
+                            break
+                        for host in doomed:
+                            logger.warning(
+                                "Host %r: skipped, dependency failed", host.name
+                            )
+                            failed.add(host.name)
+                            pending.remove(host)
+            finally:
+                _host_guard.done_waiting(waiter)
+                for future, host in running.items():
+                    if future.cancel():
+                        _host_guard.release(host, job)
+                    else:
+                        future.add_done_callback(
+                            lambda _, h=host: _host_guard.release(h, job)
+                        )
+
+    def _select_hosts(
+        self, task: Callable[..., Any], on_good: bool, on_failed: bool, **kwargs: Any
+    ) -> List[Host]:
+        run_on = []
+        if on_good:
+            for name, host in self.inventory.hosts.items():
+                if name not in self.data.failed_hosts:
+                    run_on.append(host)
+        if on_failed:
+            for name, host in self.inventory.hosts.items():
+                if name in self.data.failed_hosts:
+                    run_on.append(host)
+
+        num_hosts = len(self.inventory.hosts)
+        task_name = kwargs.get("name") or task.__name__
+        if num_hosts:
+            logger.info(
+                f"Running task %r with args %s on %d hosts",
+                task_name,
+                kwargs,
+                num_hosts,
+            )
+        else:
+            logger.warning("Task %r has not been run – 0 hosts selected", task_name)
+        return run_on
 
     def run(
         self,
@@ -82,6 +546,21 @@ class Nornir(object):
         raise_on_error=None,
         on_good=True,
         on_failed=False,
+        min_workers=1,
+        max_workers=100,
+        concurrency_limits=None,
+        task_timeout=None,
+        run_timeout=None,
+        batch_size=None,
+        batch_percent=None,
+        max_fail_percentage=None,
+        priority=None,
+        resume=None,
+        cancel_event=None,
+        depends_on=None,
+        cache=None,
+        sink=None,
+        intern=None,
         **kwargs,
     ):
         """
@@ -90,7 +569,234 @@ class Nornir(object):
         Arguments:
             task (``callable``): function or callable that will be run against each device in
               the inventory
-            num_workers(``int``): Override for how many hosts to run in paralell for this task
+            num_workers(``int``): Override for how many hosts to run in paralell for this task.
+              If ``"auto"`` it's adjusted during the execution, starting from
+              ``config.core.num_workers``, depending on the time it takes to run
+              the task, the number of hosts failing and the CPU used, see
+              :obj:`nornir.core.pool.Autoscaler`. The setting at the end of the
+              execution, and its changes, are available in the ``stats`` of the
+              result
+            raise_on_error (``bool``): Override raise_on_error behavior
+            on_good(``bool``): Whether to run or not this task on hosts marked as good
+            on_failed(``bool``): Whether to run or not this task on hosts marked as failed
+            min_workers(``int``): Minimum number of workers when ``num_workers`` is
+              ``"auto"``
+            max_workers(``int``): Maximum number of workers when ``num_workers`` is
+              ``"auto"``
+            concurrency_limits(``dict``): Maximum number of hosts with the same value for
+              a given attribute, as returned by :meth:`nornir.core.inventory.Host.get`,
+              to run in parallel. For instance, ``{"site": 5}`` will never run more
+              than 5 hosts of the same site at the same time. Hosts without the
+              attribute are not limited. Lists are limited per element, so
+              ``{"groups": 1}`` runs one host of each group at a time
+            task_timeout(``float``): Maximum number of seconds a host can spend running
+              the task
+            run_timeout(``float``): Maximum number of seconds the whole run can take
+
+            Hosts going over ``task_timeout`` or ``run_timeout`` will fail with a
+            :obj:`nornir.core.exceptions.NornirTimeoutError` and get their connections
+            closed. The threads running them are replaced until they are done.
+            batch_size(``int``): Run the task in batches of this many hosts, a batch
+              doesn't start until the previous one is done
+            batch_percent(``float``): Same as ``batch_size`` but as a percentage of
+              the hosts the task runs on
+            max_fail_percentage(``float``): Stop starting hosts as soon as more than
+              this percentage of the hosts in the current batch fail. Hosts that didn't
+              start are reported with a result whose ``skipped`` attribute is ``True``,
+              they are not marked as failed. Without batches, the whole run is a batch
+            priority(``callable``): Function taking a
+              :obj:`nornir.core.inventory.Host` and returning a number, hosts with
+              higher numbers are started first. Defaults to starting first the hosts
+              that took longer to run the same task in the past, as recorded in
+              :attr:`durations`, and the ones that never ran it before that
+            resume(``str``): Identifier of the job. The result of each host is
+              recorded in the :obj:`nornir.core.journal.Journal` at
+              ``config.core.journal_file`` as soon as it completes. If results were
+              already recorded for this job, for instance because a previous
+              execution was interrupted, the hosts they belong to don't run the task
+              again and the recorded results are returned instead
+            cancel_event(:obj:`threading.Event`): Once set, no more hosts are started.
+              Hosts that didn't start are reported as with ``max_fail_percentage``
+            depends_on(``str`` or ``callable``): Name of the attribute, as returned by
+              :meth:`nornir.core.inventory.Host.get`, or function taking a
+              :obj:`nornir.core.inventory.Host`, returning the names of the hosts or
+              groups that have to complete successfully before the host can start.
+              For instance, setting ``depends_on: [leaves]`` in the data of the group
+              ``spines`` and running with ``depends_on="depends_on"`` will start
+              the spines once all the leaves are done while running as many hosts
+              as possible in parallel. Hosts not selected to run the task are
+              ignored. If a host fails, the hosts depending on it are reported as
+              with ``max_fail_percentage``. Combine it with ``concurrency_limits``
+              to, for instance, run one device of each redundant pair at a time.
+              Can't be used with batches
+            cache(:obj:`nornir.core.cache.ResultCache`): Cache to take the results
+              from, hosts with fresh results in the cache don't run the task. The
+              results of the hosts that run the task and don't fail are cached
+            sink(:obj:`nornir.core.sink.ResultSink`): Sink to send the results of
+              each host to as soon as it completes. Only a
+              :obj:`nornir.core.sink.ResultSummary` of each host is kept in memory
+              and returned, so memory doesn't grow with the number of hosts.
+              Results can be read back with :meth:`nornir.core.sink.ResultSummary.load`
+            intern(:obj:`nornir.core.intern.PayloadStore`): Store to intern the
+              payloads of the results of each host into as soon as it completes,
+              see :meth:`nornir.core.task.AggregatedResult.intern`
+            **kwargs: additional argument to pass to ``task`` when calling it
+
+        Raises:
+            :obj:`nornir.core.exceptions.NornirExecutionError`: if at least a task fails
+              and self.config.core.raise_on_error is set to ``True``
+
+        Returns:
+            :obj:`nornir.core.task.AggregatedResult`: results of each execution
+        """
+        num_workers = self._num_workers(num_workers, min_workers, max_workers)
+        run_on = self._select_hosts(task, on_good, on_failed, **kwargs)
+
+        done = {}
+        journal = None
+        if resume:
+            task_name = kwargs.get("name") or task.__name__
+            journal = Journal(self.config.core.journal_file)
+            done = journal.load(resume, task_name)
+            if done:
+                logger.info("Job %r: %d hosts already completed", resume, len(done))
+
+        if cache is not None:
+            task_id = _task_id(task)
+            for host in run_on:
+                if host.name not in done:
+                    cached = cache.get(host.name, task_id, kwargs)
+                    if cached is not None:
+                        done[host.name] = cached
+
+        if journal or cache is not None or sink is not None or intern is not None:
+
+            def on_result(r):
+                if intern is not None:
+                    _intern_results(r, intern)
+                if not getattr(r, "skipped", False):
+                    if journal:
+                        journal.record(resume, task_name, r)
+                    if cache is not None and not r.failed:
+                        cache.set(r.host.name, task_id, kwargs, r)
+                return ResultSummary(r.host, r, sink) if sink is not None else r
+
+        else:
+            on_result = None
+
+        pending = [h for h in run_on if h.name not in done]
+        try:
+            if num_workers == 1 and not (
+                task_timeout
+                or run_timeout
+                or batch_size
+                or batch_percent
+                or max_fail_percentage is not None
+                or priority
+                or cancel_event
+                or depends_on
+            ):
+                result = self._run_serial(task, pending, on_result=on_result, **kwargs)
+            else:
+                result = self._run_parallel(
+                    task,
+                    pending,
+                    num_workers,
+                    on_result=on_result,
+                    concurrency_limits=concurrency_limits,
+                    task_timeout=task_timeout,
+                    run_timeout=run_timeout,
+                    batch_size=batch_size,
+                    batch_percent=batch_percent,
+                    max_fail_percentage=max_fail_percentage,
+                    priority=priority,
+                    cancel_event=cancel_event,
+                    depends_on=depends_on,
+                    **kwargs,
+                )
+        finally:
+            if journal:
+                journal.close()
+        self.durations.save()
+        result.payloads = intern
+
+        if done:
+            for host in run_on:
+                if host.name in done:
+                    r = _attach_results(done[host.name], host)
+                    if intern is not None:
+                        _intern_results(r, intern)
+                    if sink is not None:
+                        r = ResultSummary(host, r, sink)
+                    result[host.name] = r
+                else:
+                    result[host.name] = result.pop(host.name)
+
+        return self._process_result(result, raise_on_error)
+
+    def submit(self, task, **kwargs):
+        """
+        Same as :meth:`run` but without waiting for the run to complete. For instance:
+
+            upgrade = nr.filter(site="site1").submit(upgrade_os)
+            backup = nr.filter(site="site2").submit(backup_config)
+            print_result(backup.result())
+            upgrade.cancel()
+
+        Hosts are run on the worker threads shared by all runs. A host is never run
+        by two runs at the same time, so its connections aren't used concurrently;
+        if runs overlap, the hosts in common are run by a run once the other one is
+        done with them.
+
+        Arguments:
+            task (``callable``): function or callable that will be run against each device in
+              the inventory
+            **kwargs: arguments to pass to :meth:`run`, including the ones to pass
+              to ``task``
+
+        Returns:
+            :obj:`nornir.core.pool.RunHandle`: handle to wait for the result of the run
+              or cancel it
+        """
+        handle = RunHandle()
+
+        def run():
+            try:
+                result = self.run(task, cancel_event=handle.cancel_event, **kwargs)
+            except BaseException as e:
+                handle.future.set_exception(e)
+            else:
+                handle.future.set_result(result)
+
+        handle.future.set_running_or_notify_cancel()
+        threading.Thread(target=run, name="nornir-run", daemon=True).start()
+        return handle
+
+    async def run_async(
+        self,
+        task,
+        num_workers=None,
+        raise_on_error=None,
+        on_good=True,
+        on_failed=False,
+        **kwargs,
+    ):
+        """
+        Coroutine to run task over all the hosts in the inventory using ``asyncio``.
+
+        ``task`` can be a coroutine function, in which case it's awaited directly
+        and its subtasks can be awaited with :meth:`nornir.core.task.Task.run_async`,
+        or a regular function, in which case it's run in the default executor of
+        the event loop.
+
+        Like :meth:`run`, hosts being run by other runs, like the ones started with
+        :meth:`submit`, are waited for so their connections are never used by two
+        runs at the same time.
+
+        Arguments:
+            task (``callable``): function, coroutine function or callable that will be run
+              against each device in the inventory
+            num_workers(``int``): Override for how many hosts to run concurrently for this task
             raise_on_error (``bool``): Override raise_on_error behavior
             on_good(``bool``): Whether to run or not this task on hosts marked as good
             on_failed(``bool``): Whether to run or not this task on hosts marked as failed
@@ -104,34 +810,256 @@ class Nornir(object):
             :obj:`nornir.core.task.AggregatedResult`: results of each execution
         """
         num_workers = num_workers or self.config.core.num_workers
+        run_on = self._select_hosts(task, on_good, on_failed, **kwargs)
+        semaphore = asyncio.Semaphore(num_workers)
+        job = _host_guard.job() or object()
 
-        run_on = []
-        if on_good:
-            for name, host in self.inventory.hosts.items():
-                if name not in self.data.failed_hosts:
-                    run_on.append(host)
-        if on_failed:
-            for name, host in self.inventory.hosts.items():
-                if name in self.data.failed_hosts:
-                    run_on.append(host)
+        async def start(host):
+            busy = _host_guard.acquire(host, job)
+            while busy:
+                await asyncio.wrap_future(busy)
+                busy = _host_guard.acquire(host, job)
+            try:
+                async with semaphore:
+                    t = Task(task, **kwargs)
+                    t._job = job
+                    r = await t.start_async(host, self)
+            finally:
+                _host_guard.release(host, job)
+            return self._spill_results(r)
 
-        num_hosts = len(self.inventory.hosts)
-        task_name = kwargs.get("name") or task.__name__
-        if num_hosts:
-            logger.info(
-                f"Running task %r with args %s on %d hosts",
-                task_name,
-                kwargs,
-                num_hosts,
-            )
+        result = AggregatedResult(kwargs.get("name") or task.__name__)
+        for r in await asyncio.gather(*[start(h) for h in run_on]):
+            result[r.host.name] = r
+
+        return self._process_result(result, raise_on_error)
+
+    def run_pipeline(
+        self,
+        tasks,
+        num_workers=None,
+        raise_on_error=None,
+        on_good=True,
+        on_failed=False,
+        concurrency_limits=None,
+    ):
+        """
+        Run a sequence of tasks over all the hosts in the inventory. Unlike calling
+        :meth:`run` once per task, each host moves on to the next task as soon as
+        it's done with the previous one instead of waiting for the rest of the hosts.
+        If a task fails for a host the remaining tasks aren't run for that host.
+
+        Arguments:
+            tasks (``list``): tasks to run, each element can be either a ``callable``
+              or a ``(callable, kwargs)`` tuple where ``kwargs`` is a ``dict`` with the
+              additional arguments to pass to it
+            num_workers(``int``): Override for how many hosts to run in paralell
+            raise_on_error (``bool``): Override raise_on_error behavior
+            on_good(``bool``): Whether to run or not the tasks on hosts marked as good
+            on_failed(``bool``): Whether to run or not the tasks on hosts marked as failed
+            concurrency_limits(``dict``): See :meth:`run`
+
+        Raises:
+            :obj:`nornir.core.exceptions.NornirExecutionError`: if at least a task fails
+              and self.config.core.raise_on_error is set to ``True``
+
+        Returns:
+            ``list`` of :obj:`nornir.core.task.AggregatedResult`: results of each task,
+            hosts that didn't reach a task aren't present in its results
+        """
+        num_workers = num_workers or self.config.core.num_workers
+        steps = [(t, {}) if callable(t) else t for t in tasks]
+        run_on = self._select_hosts(steps[0][0], on_good, on_failed, **steps[0][1])
+
+        def run_chain(host):
+            results = []
+            for task, kwargs in steps:
+                r = self._spill_results(Task(task, **kwargs).start(host, self))
+                results.append(r)
+                if r.failed:
+                    break
+            return host, results
+
+        if num_workers == 1:
+            chains = {}
+            job = _host_guard.job() or object()
+            for host in run_on:
+                with _host_guard.hold(host, job):
+                    chains[host] = run_chain(host)[1]
         else:
-            logger.warning("Task %r has not been run – 0 hosts selected", task_name)
+            chains = dict(
+                self._dispatch(run_chain, run_on, num_workers, concurrency_limits)
+            )
+
+        results = [
+            AggregatedResult(kwargs.get("name") or task.__name__)
+            for task, kwargs in steps
+        ]
+        for host in run_on:
+            for result, r in zip(results, chains[host]):
+                result[host.name] = r
+        for result in results:
+            self._process_result(result, raise_on_error)
+        return results
+
+    def run_per(
+        self,
+        task,
+        key,
+        num_workers=None,
+        raise_on_error=None,
+        on_good=True,
+        on_failed=False,
+        **kwargs,
+    ):
+        """
+        Run task once per distinct value of ``key`` instead of once per host. The
+        task is run on the first host with each value and its result is shared with
+        the rest of the hosts with the same value. Useful for tasks that do the same
+        work for every host of, for instance, a site:
+
+            nr.run_per(task=render_site_template, key="site")
+
+        Hosts without a value for ``key`` run the task on their own.
+
+        Arguments:
+            task (``callable``): function or callable that will be run once per value
+            key (``str`` or ``callable``): Name of the attribute, as returned by
+              :meth:`nornir.core.inventory.Host.get`, or function taking a
+              :obj:`nornir.core.inventory.Host` and returning the value to group
+              the hosts by. Values have to be hashable, lists are turned into tuples
+              so ``key="groups"`` runs the task once per distinct set of groups
+            num_workers(``int``): Override for how many values to run in paralell,
+              see :meth:`run`
+            raise_on_error (``bool``): Override raise_on_error behavior
+            on_good(``bool``): Whether to run or not this task on hosts marked as good
+            on_failed(``bool``): Whether to run or not this task on hosts marked as failed
+            **kwargs: additional argument to pass to ``task`` when calling it
+
+        Raises:
+            :obj:`nornir.core.exceptions.NornirExecutionError`: if at least a task fails
+              and self.config.core.raise_on_error is set to ``True``
+
+        Returns:
+            :obj:`nornir.core.task.AggregatedResult`: results of each host, hosts
+            sharing a value get a copy of the same results
+        """
+        num_workers = self._num_workers(num_workers, 1, 100)
+        run_on = self._select_hosts(task, on_good, on_failed, **kwargs)
+
+        members = {}
+        for host in run_on:
+            value = key(host) if callable(key) else host.get(key)
+            if isinstance(value, MutableSequence):
+                value = tuple(value)
+            ident = ("host", host.name) if value is None else ("key", value)
+            members.setdefault(ident, []).append(host)
+        first = [hosts[0] for hosts in members.values()]
 
         if num_workers == 1:
-            result = self._run_serial(task, run_on, **kwargs)
+            shared = self._run_serial(task, first, **kwargs)
         else:
-            result = self._run_parallel(task, run_on, num_workers, **kwargs)
+            shared = self._run_parallel(task, first, num_workers, **kwargs)
+        self.durations.save()
+
+        result = AggregatedResult(shared.name)
+        result.stats = shared.stats
+        owner = {
+            host.name: hosts[0].name for hosts in members.values() for host in hosts
+        }
+        for host in run_on:
+            r = shared[owner[host.name]]
+            if host.name != owner[host.name]:
+                r = _attach_results(_copy_results(r), host)
+            result[host.name] = r
+        return self._process_result(result, raise_on_error)
+
+    def run_sharded(
+        self,
+        task,
+        num_shards=None,
+        num_workers=None,
+        raise_on_error=None,
+        on_good=True,
+        on_failed=False,
+        **kwargs,
+    ):
+        """
+        Run task over all the hosts in the inventory splitting them amongst several
+        processes. Hosts are assigned to a shard based on a hash of their name and
+        each shard is run by a child process with its own pool of worker threads and
+        its own connections. Results are merged back into a single
+        :obj:`nornir.core.task.AggregatedResult`.
+
+        As tasks run in a different process, ``task`` and ``kwargs`` must be picklable,
+        which for functions means importable as the child processes are spawned, and
+        changes done by the task to the hosts' data aren't seen by this object.
+        Connections are opened by the child processes and closed once they finish.
+        How long each host took is recorded in :attr:`durations` by this object.
+
+        Arguments:
+            task (``callable``): function or callable that will be run against each device in
+              the inventory
+            num_shards(``int``): Number of processes to use, defaults to the number of CPUs
+            num_workers(``int``): Override for how many hosts each shard runs in paralell
+            raise_on_error (``bool``): Override raise_on_error behavior
+            on_good(``bool``): Whether to run or not this task on hosts marked as good
+            on_failed(``bool``): Whether to run or not this task on hosts marked as failed
+            **kwargs: additional argument to pass to ``task`` when calling it
+
+        Raises:
+            :obj:`nornir.core.exceptions.NornirExecutionError`: if at least a task fails
+              and self.config.core.raise_on_error is set to ``True``
+
+        Returns:
+            :obj:`nornir.core.task.AggregatedResult`: results of each execution
+        """
+        num_shards = num_shards or os.cpu_count() or 1
+        num_workers = num_workers or self.config.core.num_workers
+        run_on = self._select_hosts(task, on_good, on_failed, **kwargs)
+        name = kwargs.get("name") or task.__name__
 
+        shards = [Hosts() for _ in range(num_shards)]
+        for host in run_on:
+            shards[zlib.crc32(host.name.encode()) % num_shards][host.name] = host
+
+        results = {}
+        durations = {}
+        with _process_pool(num_shards) as executor:
+            futures = [
+                executor.submit(
+                    _run_shard,
+                    Inventory(
+                        hosts=hosts,
+                        groups=self.inventory.groups,
+                        defaults=self.inventory.defaults,
+                    ),
+                    self.config,
+                    self.data.dry_run,
+                    task,
+                    num_workers,
+                    kwargs,
+                    {h: self.durations.get(name, h) for h in hosts},
+                )
+                for hosts in shards
+                if hosts
+            ]
+            for future in futures:
+                shard_results, shard_durations = future.result()
+                results.update(shard_results)
+                durations.update(shard_durations)
+
+        result = AggregatedResult(name)
+        for host in run_on:
+            result[host.name] = _attach_results(results[host.name], host)
+            if durations.get(host.name) is not None:
+                self.durations.record(name, host.name, durations[host.name])
+        self.durations.save()
+        return self._process_result(result, raise_on_error)
+
+    def _process_result(
+        self, result: AggregatedResult, raise_on_error: Optional[bool]
+    ) -> AggregatedResult:
         raise_on_error = (
             raise_on_error
             if raise_on_error is not None
@@ -143,15 +1071,105 @@ class Nornir(object):
             self.data.failed_hosts.update(result.failed_hosts.keys())
         return result
 
+    def run_iter(
+        self,
+        task,
+        num_workers=None,
+        on_good=True,
+        on_failed=False,
+        min_workers=1,
+        max_workers=100,
+        concurrency_limits=None,
+        task_timeout=None,
+        run_timeout=None,
+        batch_size=None,
+        batch_percent=None,
+        max_fail_percentage=None,
+        priority=None,
+        cancel_event=None,
+        depends_on=None,
+        **kwargs,
+    ) -> Iterator[MultiResult]:
+        """
+        Run task over all the hosts in the inventory yielding the result of each host
+        as soon as it completes instead of waiting for all of them to finish.
+
+        Hosts that fail are added to the failed hosts as their results are yielded.
+        Note that ``raise_on_error`` is not supported as results are consumed before
+        the execution is over, inspect the ``failed`` attribute of each result instead.
+
+        Arguments:
+            task (``callable``): function or callable that will be run against each device in
+              the inventory
+            num_workers(``int``): Override for how many hosts to run in paralell for this task,
+              see :meth:`run`
+            on_good(``bool``): Whether to run or not this task on hosts marked as good
+            on_failed(``bool``): Whether to run or not this task on hosts marked as failed
+            min_workers(``int``): See :meth:`run`
+            max_workers(``int``): See :meth:`run`
+            concurrency_limits(``dict``): See :meth:`run`
+            task_timeout(``float``): See :meth:`run`
+            run_timeout(``float``): See :meth:`run`
+            batch_size(``int``): See :meth:`run`
+            batch_percent(``float``): See :meth:`run`
+            max_fail_percentage(``float``): See :meth:`run`
+            priority(``callable``): See :meth:`run`
+            cancel_event(:obj:`threading.Event`): See :meth:`run`
+            depends_on(``str`` or ``callable``): See :meth:`run`
+            **kwargs: additional argument to pass to ``task`` when calling it
+
+        Yields:
+            :obj:`nornir.core.task.MultiResult`: results of each host in order of completion
+        """
+        num_workers = self._num_workers(num_workers, min_workers, max_workers)
+        run_on = self._select_hosts(task, on_good, on_failed, **kwargs)
+
+        if num_workers == 1 and not (
+            task_timeout
+            or run_timeout
+            or batch_size
+            or batch_percent
+            or max_fail_percentage is not None
+            or priority
+            or cancel_event
+            or depends_on
+        ):
+            results = self._iter_serial(task, run_on, **kwargs)
+        else:
+            results = self._run_hosts(
+                task,
+                run_on,
+                num_workers,
+                concurrency_limits=concurrency_limits,
+                task_timeout=task_timeout,
+                run_timeout=run_timeout,
+                batch_size=batch_size,
+                batch_percent=batch_percent,
+                max_fail_percentage=max_fail_percentage,
+                priority=priority,
+                cancel_event=cancel_event,
+                depends_on=depends_on,
+                **kwargs,
+            )
+
+        try:
+            for r in results:
+                if r.failed:
+                    self.data.failed_hosts.add(r.host.name)
+                yield r
+        finally:
+            self.durations.save()
+
     def dict(self):
         """ Return a dictionary representing the object. """
         return {"data": self.data.dict(), "inventory": self.inventory.dict()}
 
-    def close_connections(self, on_good=True, on_failed=False):
+    def close_connections(self, on_good: bool = True, on_failed: bool = False) -> None:
         def close_connections_task(task):
             task.host.close_connections()
 
         self.run(task=close_connections_task, on_good=on_good, on_failed=on_failed)
+        self.pool.close()
 
     @classmethod
     def get_validators(cls):
@@ -166,3 +1184,56 @@ class Nornir(object):
     @property
     def state(self):
         return GlobalState
+
+
+def _limit_values(host, attr):
+    value = host.get(attr)
+    if value is None:
+        return []
+    values = value if isinstance(value, MutableSequence) else [value]
+    for v in values:
+        try:
+            hash(v)
+        except TypeError:
+            raise ValueError(
+                f"concurrency limit for {attr!r} can't be applied to host "
+                f"{host.name!r}, its value {v!r} is not hashable"
+            ) from None
+    return list(dict.fromkeys(values))
+
+
+def _close_and_release(host, job):
+    try:
+        _close_connections(host)
+    finally:
+        _host_guard.release(host, job)
+
+
+def _run_shard(inventory, config, dry_run, task, num_workers, kwargs, expected):
+    # durations are recorded and saved by the parent, the shard returns how long
+    # each host took and starts first the ones expected to be the slowest
+    nr = Nornir(
+        inventory=inventory,
+        config=config,
+        data=GlobalState(dry_run=dry_run),
+        durations=Durations(),
+    )
+
+    def priority(host):
+        seconds = expected.get(host.name)
+        return float("inf") if seconds is None else seconds
+
+    try:
+        result = nr.run(
+            task,
+            num_workers=num_workers,
+            raise_on_error=False,
+            priority=priority,
+            **kwargs,
+        )
+    finally:
+        nr.close_connections(on_good=True, on_failed=True)
+    return (
+        {h: _detach_results(r) for h, r in result.items()},
+        {h: nr.durations.get(result.name, h) for h in result},
+    )
@@ -0,0 +1,134 @@
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from nornir.core.task import MultiResult, _detached_copy
+
+
+class ResultCache(object):
+    """
+    Cache of the results of the tasks :meth:`nornir.core.Nornir.run` is given with
+    its ``cache`` argument, so read-only tasks like gathering facts don't have to
+    run again, nor open any connection, while their results are fresh.
+
+    Results are keyed by host, task and arguments passed to the task, arguments are
+    compared by their ``repr``. Only results of hosts that didn't fail are cached.
+    Tasks are identified by their module and name, so lambdas and nested functions
+    with the same name share entries.
+
+    Entries are kept in an SQLite database, in memory unless ``path`` is set, and
+    stored with :mod:`pickle` like in :obj:`nornir.core.journal.Journal`.
+
+    Arguments:
+        path(``str``): path of the database, it's created if it doesn't exist
+        ttl(``float``): number of seconds an entry is valid for, forever if ``None``
+        max_entries(``int``): maximum number of entries to keep, the least recently
+          used ones are evicted first
+
+    Attributes:
+        path(``str``): path of the database
+        ttl(``float``): number of seconds an entry is valid for
+        max_entries(``int``): maximum number of entries to keep
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        with self._conn:
+            if path:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "host TEXT NOT NULL, task TEXT NOT NULL, params TEXT NOT NULL, "
+                "created REAL NOT NULL, used REAL NOT NULL, result BLOB NOT NULL, "
+                "PRIMARY KEY (host, task, params))"
+            )
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, exc_type: object, exc_val: object, exc_tb: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()
+        count: int = row[0]
+        return count
+
+    def get(
+        self, host: str, task: str, params: Dict[str, Any]
+    ) -> Optional[MultiResult]:
+        """
+        Return the results cached for ``host`` running ``task`` with ``params``, if
+        any and not expired. Results are not attached to any
+        :obj:`nornir.core.inventory.Host`.
+        """
+        key = (host, task, _params(params))
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT created, result FROM results "
+                "WHERE host = ? AND task = ? AND params = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            if self.ttl is not None and row[0] + self.ttl <= now:
+                self._conn.execute(
+                    "DELETE FROM results WHERE host = ? AND task = ? AND params = ?",
+                    key,
+                )
+                return None
+            self._conn.execute(
+                "UPDATE results SET used = ? "
+                "WHERE host = ? AND task = ? AND params = ?",
+                (now,) + key,
+            )
+        results: MultiResult = pickle.loads(row[1])
+        return results
+
+    def set(
+        self, host: str, task: str, params: Dict[str, Any], results: MultiResult
+    ) -> None:
+        """Cache ``results`` of ``host`` running ``task`` with ``params``"""
+        data = pickle.dumps(_detached_copy(results))
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (host, task, _params(params), now, now, data),
+            )
+            if self.max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM results WHERE rowid NOT IN ("
+                    "SELECT rowid FROM results ORDER BY used DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+
+    def clear(self) -> None:
+        """Forget all the entries"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _params(params: Dict[str, Any]) -> str:
+    return repr(sorted(params.items()))
+
+
+def _task_id(task: Any) -> str:
+    name = getattr(task, "__qualname__", None) or getattr(task, "__name__", "")
+    return "{}.{}".format(getattr(task, "__module__", ""), name)
@@ -114,11 +114,30 @@ class Jinja2Config(object):
 
 
 class CoreConfig(object):
-    __slots__ = ("num_workers", "raise_on_error")
+    __slots__ = (
+        "num_workers",
+        "num_processes",
+        "raise_on_error",
+        "durations_file",
+        "journal_file",
+        "spill_threshold",
+    )
 
-    def __init__(self, num_workers: int, raise_on_error: bool) -> None:
+    def __init__(
+        self,
+        num_workers: int,
+        num_processes: Optional[int],
+        raise_on_error: bool,
+        durations_file: Optional[str],
+        journal_file: str,
+        spill_threshold: Optional[int],
+    ) -> None:
         self.num_workers = num_workers
+        self.num_processes = num_processes
         self.raise_on_error = raise_on_error
+        self.durations_file = durations_file
+        self.journal_file = journal_file
+        self.spill_threshold = spill_threshold
 
 
 class Config(object):
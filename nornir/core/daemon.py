@@ -0,0 +1,242 @@
+import logging
+import threading
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Callable, Dict, Iterator, Optional, Set, Tuple, Union
+
+from nornir.core import Nornir
+from nornir.core.deserializer.configuration import _resolve_import_from_string
+from nornir.core.state import GlobalState
+from nornir.core.task import AggregatedResult, MultiResult
+from nornir.core.task import _detach_results, _picklable
+from nornir.init_nornir import InitNornir
+
+
+logger = logging.getLogger(__name__)
+
+Address = Union[str, Tuple[str, int]]
+
+
+class Daemon(object):
+    """
+    Keeps a :obj:`nornir.core.Nornir` object, with its inventory, worker threads
+    and the connections opened by the tasks, alive and runs the tasks submitted by
+    :obj:`DaemonClient` objects connected over a Unix or TCP socket. Results of
+    each host are sent back to the client as soon as they are available.
+
+    Each client is served by its own thread so jobs from different clients run
+    concurrently. Each job gets its own :obj:`nornir.core.state.GlobalState` so
+    hosts failing in one job don't affect the others.
+
+    Messages are serialized with :mod:`pickle` so an ``authkey`` is required to
+    listen on TCP.
+
+    Arguments:
+        nornir (:obj:`nornir.core.Nornir`): object to run the tasks with
+        address: address to listen on, either a ``(host, port)`` tuple or the path
+          of a Unix socket. Defaults to a Unix socket in a temporary directory
+        authkey (``bytes``): key clients will have to authenticate with
+
+    Attributes:
+        address: address the daemon is listening on
+    """
+
+    def __init__(
+        self,
+        nornir: Nornir,
+        address: Optional[Address] = None,
+        authkey: Optional[bytes] = None,
+    ) -> None:
+        if isinstance(address, tuple) and authkey is None:
+            raise ValueError("an authkey is required to listen on TCP")
+        self.nornir = nornir
+        self._listener = Listener(address, authkey=authkey)
+        self._lock = threading.Lock()
+        self._clients: Set[Connection] = set()
+        self._closed = False
+        self._thread = threading.Thread(target=self._accept, daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "Daemon":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    @property
+    def address(self) -> Address:
+        return self._listener.address  # type: ignore
+
+    def serve_forever(self) -> None:
+        """Block until :meth:`close` is called"""
+        self._thread.join()
+
+    def close(self) -> None:
+        """Stop accepting jobs, disconnect the clients and close the connections"""
+        with self._lock:
+            self._closed = True
+            clients, self._clients = self._clients, set()
+        self._listener.close()
+        for conn in clients:
+            conn.close()
+        self.nornir.close_connections(on_good=True, on_failed=True)
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                conn = self._listener.accept()
+            except Exception:
+                with self._lock:
+                    if self._closed:
+                        return
+                logger.exception("Failed to accept client")
+                continue
+            with self._lock:
+                if self._closed:
+                    conn.close()
+                    return
+                self._clients.add(conn)
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: Connection) -> None:
+        try:
+            while True:
+                _, task, filters, kwargs = conn.recv()
+                try:
+                    self._run(conn, task, filters, kwargs)
+                except (EOFError, OSError):
+                    raise
+                except Exception as e:
+                    logger.exception("Job %r failed", task)
+                    conn.send(("error", _picklable(e)))
+        except (EOFError, OSError):
+            pass
+        finally:
+            conn.close()
+            with self._lock:
+                self._clients.discard(conn)
+
+    def _run(
+        self,
+        conn: Connection,
+        task: Union[str, Callable[..., Any]],
+        filters: Dict[str, Any],
+        kwargs: Dict[str, Any],
+    ) -> None:
+        func = _resolve_import_from_string(task)
+        if func is None:
+            raise ValueError("no task given")
+        nr = self.nornir.filter(**filters) if filters else self.nornir
+        nr = Nornir(
+            inventory=nr.inventory,
+            config=nr.config,
+            data=GlobalState(dry_run=nr.data.dry_run),
+            pool=nr.pool,
+            durations=nr.durations,
+        )
+        for r in nr.run_iter(func, **kwargs):
+            conn.send(("result", r.host.name, _detach_results(r)))
+        conn.send(("done",))
+
+
+class DaemonClient(object):
+    """
+    Submits jobs to a :obj:`Daemon`.
+
+    Arguments:
+        address: address the daemon is listening on
+        authkey (``bytes``): key to authenticate with the daemon
+    """
+
+    def __init__(self, address: Address, authkey: Optional[bytes] = None) -> None:
+        self._conn = Client(address, authkey=authkey)
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def run_iter(
+        self,
+        task: Union[str, Callable[..., Any]],
+        filters: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Iterator[Tuple[str, MultiResult]]:
+        """
+        Run a task in the daemon yielding the results of each host as soon as they
+        are received. Only a job can run at a time per client, if the iteration is
+        stopped early the remaining results are discarded once they are received.
+
+        Arguments:
+            task: import path of the task, for instance
+              ``"nornir.plugins.tasks.commands.command"``, or the task itself, in
+              which case it has to be importable by the daemon
+            filters(``dict``): arguments to pass to :meth:`nornir.core.Nornir.filter`
+              to select the hosts to run the task on
+            **kwargs: arguments to pass to :meth:`nornir.core.Nornir.run_iter`,
+              including the ones to pass to ``task``. They have to be picklable
+
+        Raises:
+            Exception: if the job couldn't be started, for instance because ``task``
+              can't be imported
+
+        Yields:
+            name of the host and its :obj:`nornir.core.task.MultiResult`, results
+            are not attached to any host
+        """
+        self._conn.send(("run", task, filters or {}, kwargs))
+        done = False
+        try:
+            while True:
+                msg = self._conn.recv()
+                if msg[0] == "done":
+                    done = True
+                    return
+                if msg[0] == "error":
+                    done = True
+                    raise msg[1]
+                yield msg[1], msg[2]
+        finally:
+            while not done and self._conn.recv()[0] not in ("done", "error"):
+                pass
+
+    def run(
+        self,
+        task: Union[str, Callable[..., Any]],
+        filters: Optional[Dict[str, Any]] = None,
+        raise_on_error: bool = False,
+        **kwargs: Any,
+    ) -> AggregatedResult:
+        """
+        Same as :meth:`run_iter` but waiting for all the hosts to complete.
+
+        Raises:
+            :obj:`nornir.core.exceptions.NornirExecutionError`: if at least a task
+              fails and ``raise_on_error`` is ``True``
+
+        Returns:
+            :obj:`nornir.core.task.AggregatedResult`: results of each execution
+        """
+        name = str(kwargs.get("name") or getattr(task, "__name__", task))
+        result = AggregatedResult(name.rsplit(".", 1)[-1])
+        for host, r in self.run_iter(task, filters, **kwargs):
+            result[host] = r
+        if raise_on_error:
+            result.raise_on_error()
+        return result
+
+
+def serve(address: Address, authkey: Optional[bytes] = None, **kwargs: Any) -> None:
+    """
+    Start a :obj:`Daemon` and serve jobs forever.
+
+    Arguments:
+        address: address to listen on
+        authkey (``bytes``): key clients will have to authenticate with
+        **kwargs: arguments to pass to :func:`nornir.init_nornir.InitNornir`
+    """
+    with Daemon(InitNornir(**kwargs), address, authkey) as daemon:
+        daemon.serve_forever()
@@ -124,6 +124,14 @@ class CoreConfig(BaseNornirSettings):
         default=20,
         description="Number of Nornir worker threads that are run at the same time by default",
     )
+    num_processes: Optional[int] = Schema(
+        default=None,
+        description=(
+            "Number of worker processes used by "
+            ":meth:`nornir.core.task.Task.run_in_process`. "
+            "Defaults to the number of CPUs"
+        ),
+    )
     raise_on_error: bool = Schema(
         default=False,
         description=(
@@ -132,6 +140,28 @@ class CoreConfig(BaseNornirSettings):
             "if at least a host failed"
         ),
     )
+    durations_file: Optional[str] = Schema(
+        default=None,
+        description=(
+            "File where to keep how long each host takes to run each task so "
+            "the slowest hosts can be started first in future executions"
+        ),
+    )
+    journal_file: str = Schema(
+        default="nornir_journal.db",
+        description=(
+            "SQLite database where to record the results of the executions "
+            "that can be resumed, see :meth:`nornir.core.Nornir.run`"
+        ),
+    )
+    spill_threshold: Optional[int] = Schema(
+        default=None,
+        description=(
+            "Size, in characters, over which the ``result``, ``stdout`` and "
+            "``diff`` strings of the results are moved to temporary files, see "
+            ":obj:`nornir.core.spill.SpilledText`. Disabled if not set"
+        ),
+    )
 
     class Config:
         env_prefix = "NORNIR_CORE_"
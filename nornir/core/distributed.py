@@ -0,0 +1,301 @@
+import logging
+import queue
+import threading
+import time
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from nornir.core import Nornir
+from nornir.core.task import AggregatedResult, MultiResult
+from nornir.core.task import _attach_results, _detach_results, _picklable
+from nornir.init_nornir import InitNornir
+
+
+logger = logging.getLogger(__name__)
+
+Address = Union[str, Tuple[str, int]]
+
+
+class _Job(object):
+    def __init__(
+        self,
+        task: Callable[..., Any],
+        kwargs: Dict[str, Any],
+        num_workers: Optional[int],
+        dry_run: bool,
+        hosts: List[str],
+    ) -> None:
+        self.task = task
+        self.kwargs = kwargs
+        self.num_workers = num_workers
+        self.dry_run = dry_run
+        self.pending = set(hosts)
+        self.results: Dict[str, MultiResult] = {}
+        self.error: Optional[BaseException] = None
+        self.done = threading.Condition()
+
+    def add(self, host: str, result: MultiResult) -> None:
+        with self.done:
+            self.results[host] = result
+            self.pending.discard(host)
+            if not self.pending:
+                self.done.notify_all()
+
+    def fail(self, error: BaseException) -> None:
+        with self.done:
+            if self.error is None:
+                self.error = error
+            self.done.notify_all()
+
+
+class Coordinator(object):
+    """
+    Distributes the execution of tasks amongst worker processes, possibly running
+    on other machines, connected over TCP or Unix sockets. Workers are started with
+    :func:`worker` and they have to load the same inventory as the coordinator.
+
+    Hosts are sent to the workers in batches and workers stream back the result of
+    each host as soon as it completes. If a worker disconnects, the hosts it didn't
+    return results for are sent to another worker, which means those hosts may run
+    the task more than once. If a worker can't run a job at all, for instance because
+    it can't import the task, the job fails with the error the worker got.
+
+    Messages are serialized with :mod:`pickle` so an ``authkey`` is required to
+    listen on TCP.
+
+    Arguments:
+        nornir (:obj:`nornir.core.Nornir`): object whose inventory will be used to
+          select the hosts to run tasks on
+        address: address to listen on, either a ``(host, port)`` tuple or the path
+          of a Unix socket. Defaults to a Unix socket in a temporary directory
+        authkey (``bytes``): key workers will have to authenticate with
+        batch_size (``int``): number of hosts to send to a worker at a time
+        worker_timeout (``float``): number of seconds a job waits for a worker to
+          connect when there are none before failing, forever if ``None``
+
+    Attributes:
+        address: address the coordinator is listening on
+        worker_timeout (``float``): number of seconds a job waits for a worker
+    """
+
+    def __init__(
+        self,
+        nornir: Nornir,
+        address: Optional[Address] = None,
+        authkey: Optional[bytes] = None,
+        batch_size: int = 10,
+        worker_timeout: Optional[float] = 60,
+    ) -> None:
+        if isinstance(address, tuple) and authkey is None:
+            raise ValueError("an authkey is required to listen on TCP")
+        self.nornir = nornir
+        self.batch_size = batch_size
+        self.worker_timeout = worker_timeout
+        self._listener = Listener(address, authkey=authkey)
+        self._batches: queue.Queue = queue.Queue()  # type: ignore
+        self._lock = threading.Lock()
+        self._workers: Set[threading.Thread] = set()
+        self._idle_since: Optional[float] = time.monotonic()
+        self._closed = False
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def __enter__(self) -> "Coordinator":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    @property
+    def address(self) -> Address:
+        return self._listener.address  # type: ignore
+
+    @property
+    def num_workers(self) -> int:
+        """Number of workers currently connected"""
+        return len(self._workers)
+
+    def run(
+        self,
+        task: Callable[..., Any],
+        num_workers: Optional[int] = None,
+        raise_on_error: Optional[bool] = None,
+        on_good: bool = True,
+        on_failed: bool = False,
+        **kwargs: Any,
+    ) -> AggregatedResult:
+        """
+        Run task over all the hosts in the inventory using the connected workers.
+        If no worker is connected it will wait ``worker_timeout`` seconds for one
+        to connect.
+
+        ``task`` and ``kwargs`` are sent to the workers so they have to be picklable
+        and ``task`` has to be importable by the workers. Changes done by the task
+        to the hosts' data aren't seen by the coordinator.
+
+        Arguments:
+            task (``callable``): function or callable that will be run against each device in
+              the inventory
+            num_workers(``int``): Override for how many hosts each worker runs in paralell
+            raise_on_error (``bool``): Override raise_on_error behavior
+            on_good(``bool``): Whether to run or not this task on hosts marked as good
+            on_failed(``bool``): Whether to run or not this task on hosts marked as failed
+            **kwargs: additional argument to pass to ``task`` when calling it
+
+        Raises:
+            :obj:`nornir.core.exceptions.NornirExecutionError`: if at least a task fails
+              and self.config.core.raise_on_error is set to ``True``
+            TimeoutError: if no worker was connected for ``worker_timeout`` seconds
+            Exception: if a worker couldn't run the job, for instance because
+              ``task`` can't be imported
+
+        Returns:
+            :obj:`nornir.core.task.AggregatedResult`: results of each execution
+        """
+        run_on = self.nornir._select_hosts(task, on_good, on_failed, **kwargs)
+        names = [h.name for h in run_on]
+        job = _Job(task, kwargs, num_workers, self.nornir.data.dry_run, names)
+        for i in range(0, len(names), self.batch_size):
+            self._batches.put((job, names[i : i + self.batch_size]))
+        self._wait(job)
+        if job.error is not None:
+            raise job.error
+
+        result = AggregatedResult(kwargs.get("name") or task.__name__)
+        for host in run_on:
+            result[host.name] = _attach_results(job.results[host.name], host)
+        return self.nornir._process_result(result, raise_on_error)
+
+    def close(self) -> None:
+        """Stop the workers and stop accepting new ones"""
+        with self._lock:
+            self._closed = True
+            for _ in self._workers:
+                self._batches.put(None)
+        self._listener.close()
+
+    def _wait(self, job: _Job) -> None:
+        with job.done:
+            while job.pending and job.error is None:
+                if self.worker_timeout is None:
+                    job.done.wait()
+                    continue
+                job.done.wait(min(self.worker_timeout, 1))
+                with self._lock:
+                    idle_since = self._idle_since
+                if (
+                    idle_since is not None
+                    and time.monotonic() - idle_since >= self.worker_timeout
+                ):
+                    job.error = TimeoutError(
+                        "no worker connected for {}s".format(self.worker_timeout)
+                    )
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                conn = self._listener.accept()
+            except Exception:
+                with self._lock:
+                    if self._closed:
+                        return
+                logger.exception("Failed to accept worker")
+                continue
+            with self._lock:
+                if self._closed:
+                    conn.close()
+                    return
+                t = threading.Thread(target=self._serve, args=(conn,), daemon=True)
+                self._workers.add(t)
+                self._idle_since = None
+                t.start()
+
+    def _serve(self, conn: Connection) -> None:
+        try:
+            while True:
+                batch = self._batches.get()
+                if batch is None:
+                    conn.send(("stop",))
+                    return
+                if batch[0].error is None:
+                    self._run_batch(conn, *batch)
+        except (EOFError, OSError):
+            logger.warning("Lost connection with worker")
+        finally:
+            conn.close()
+            with self._lock:
+                self._workers.discard(threading.current_thread())
+                if not self._workers:
+                    self._idle_since = time.monotonic()
+
+    def _run_batch(self, conn: Connection, job: _Job, hosts: List[str]) -> None:
+        pending = set(hosts)
+        try:
+            conn.send(
+                ("run", job.task, job.kwargs, hosts, job.dry_run, job.num_workers)
+            )
+            while True:
+                msg = conn.recv()
+                if msg[0] == "done":
+                    break
+                if msg[0] == "error":
+                    logger.error("Worker failed to run job: %s", msg[1])
+                    job.fail(msg[1])
+                    break
+                _, host, result = msg
+                pending.discard(host)
+                job.add(host, result)
+        except (EOFError, OSError):
+            if pending:
+                logger.warning("Worker lost, requeuing hosts: %s", sorted(pending))
+                self._batches.put((job, [h for h in hosts if h in pending]))
+            raise
+
+
+def worker(address: Address, authkey: Optional[bytes] = None, **kwargs: Any) -> None:
+    """
+    Connect to a :obj:`Coordinator` and run the tasks it sends until it stops.
+    Errors running a job, other than the ones of the tasks, are sent back to the
+    coordinator instead of stopping the worker.
+
+    Arguments:
+        address: address the coordinator is listening on
+        authkey (``bytes``): key to authenticate with the coordinator
+        **kwargs: arguments to pass to :func:`nornir.init_nornir.InitNornir`
+    """
+    nr = InitNornir(**kwargs)
+    conn = Client(address, authkey=authkey)
+    try:
+        while True:
+            try:
+                msg = conn.recv()
+                if msg[0] == "stop":
+                    return
+                _run_job(nr, conn, *msg[1:])
+            except (EOFError, OSError):
+                raise
+            except Exception as e:
+                logger.exception("Failed to run job")
+                conn.send(("error", _picklable(e)))
+    finally:
+        nr.close_connections(on_good=True, on_failed=True)
+        conn.close()
+
+
+def _run_job(
+    nr: Nornir,
+    conn: Connection,
+    task: Callable[..., Any],
+    task_kwargs: Dict[str, Any],
+    hosts: List[str],
+    dry_run: bool,
+    num_workers: Optional[int],
+) -> None:
+    names = set(hosts)
+    nr.data.dry_run = dry_run
+    nr.data.reset_failed_hosts()
+    batch = nr.filter(filter_func=lambda h: h.name in names)
+    for r in batch.run_iter(
+        task, num_workers=num_workers, on_failed=True, **task_kwargs
+    ):
+        conn.send(("result", r.host.name, _detach_results(r)))
+    conn.send(("done",))
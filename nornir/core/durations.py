@@ -0,0 +1,67 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class Durations(object):
+    """
+    Keeps track of how long each host takes to run each task so
+    :meth:`nornir.core.Nornir.run` can start the slowest hosts first and finish
+    sooner. The expected duration is a moving average of the past runs.
+
+    The store is kept in memory and shared by all the objects returned by
+    :meth:`nornir.core.Nornir.filter`. If ``path`` is set, it's loaded from and
+    saved to that file as JSON so it survives across executions.
+
+    Arguments:
+        path(``str``): file to persist the durations to
+        weight(``float``): weight given to the latest duration when updating the
+          moving average
+
+    Attributes:
+        path(``str``): file to persist the durations to
+    """
+
+    def __init__(self, path: Optional[str] = None, weight: float = 0.5) -> None:
+        self.path = path
+        self.weight = weight
+        self._lock = threading.Lock()
+        self._durations: Dict[str, Dict[str, float]] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    self._durations = json.load(f)
+            except (OSError, ValueError):
+                logger.warning("Failed to load durations from %r", path, exc_info=True)
+
+    def get(self, task: str, host: str) -> Optional[float]:
+        """Expected number of seconds ``host`` will take to run ``task``, if known"""
+        return self._durations.get(task, {}).get(host)
+
+    def record(self, task: str, host: str, seconds: float) -> None:
+        """Update the expected duration of ``task`` for ``host``"""
+        with self._lock:
+            durations = self._durations.setdefault(task, {})
+            previous = durations.get(host)
+            if previous is not None:
+                seconds = self.weight * seconds + (1 - self.weight) * previous
+            durations[host] = seconds
+
+    def save(self) -> None:
+        """Write the durations to ``path``, if set"""
+        if not self.path:
+            return
+        with self._lock:
+            data = json.dumps(self._durations)
+        tmp = "{}.{}.tmp".format(self.path, threading.get_ident())
+        try:
+            with open(tmp, "w") as f:
+                f.write(data)
+            os.replace(tmp, self.path)
+        except OSError:
+            logger.warning("Failed to save durations to %r", self.path, exc_info=True)
@@ -106,5 +106,36 @@ class NornirSubTaskError(Exception):
         return "Subtask: {} (failed)\n".format(self.task)
 
 
+class NornirTimeoutError(Exception):
+    """
+    Raised when a host doesn't complete a task within the time allowed by
+    :meth:`nornir.core.Nornir.run`
+    """
+
+    def __init__(self, host: str, timeout: float, message: str) -> None:
+        self.host = host
+        self.timeout = timeout
+        self.message = message
+        super().__init__(host, timeout, message)
+
+    def __str__(self) -> str:
+        return "{}: {} ({}s)".format(self.host, self.message, self.timeout)
+
+
+class NornirRemoteError(Exception):
+    """
+    Raised in place of an exception that couldn't be copied from the process where
+    the task was run to the process that ran :meth:`nornir.core.Nornir.run`
+    """
+
+    def __init__(self, exception_type: str, message: str) -> None:
+        self.exception_type = exception_type
+        self.message = message
+        super().__init__(exception_type, message)
+
+    def __str__(self) -> str:
+        return "{}: {}".format(self.exception_type, self.message)
+
+
 class ConflictingConfigurationWarning(UserWarning):
     pass
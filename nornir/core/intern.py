@@ -0,0 +1,86 @@
+import hashlib
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+Payload = Union[str, bytes]
+
+
+class PayloadStore(object):
+    """
+    Keeps a single copy of each distinct large payload, like the outputs of
+    ``show version`` across devices running the same image. Values are identified
+    by the SHA-256 hash of their content. Interning the payloads of the results of
+    a fleet saves memory and tells how many distinct answers were received, see
+    :meth:`nornir.core.task.AggregatedResult.intern` and the ``intern`` argument
+    of :meth:`nornir.core.Nornir.run`.
+
+    Arguments:
+        min_size (``int``): strings and bytes shorter than this aren't interned
+
+    Attributes:
+        min_size (``int``): strings and bytes shorter than this aren't interned
+    """
+
+    def __init__(self, min_size: int = 64) -> None:
+        self.min_size = min_size
+        self._lock = threading.Lock()
+        self._values: Dict[str, Payload] = {}
+        self._counts: "Counter[str]" = Counter()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return "{}(distinct={}, duplicates={})".format(
+            self.__class__.__name__, len(self), self.duplicates
+        )
+
+    @property
+    def total(self) -> int:
+        """Number of payloads interned"""
+        return sum(self._counts.values())
+
+    @property
+    def duplicates(self) -> int:
+        """Number of payloads interned that were already stored"""
+        return self.total - len(self)
+
+    def intern(self, value: Any) -> Any:
+        """
+        Return the stored copy of ``value`` if it's a large enough string or bytes,
+        storing it first if it's the first time it's seen. Other values are returned
+        untouched.
+        """
+        if not isinstance(value, (str, bytes)) or len(value) < self.min_size:
+            return value
+        digest = _digest(value)
+        with self._lock:
+            value = self._values.setdefault(digest, value)
+            self._counts[digest] += 1
+        return value
+
+    def counts(self) -> Dict[str, int]:
+        """Number of times each payload was interned, by hash"""
+        with self._lock:
+            return dict(self._counts)
+
+    def get(self, digest: str) -> Optional[Payload]:
+        """Payload with the given hash"""
+        return self._values.get(digest)
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[Payload, int]]:
+        """
+        Return the ``n`` most common payloads and how many times they were interned,
+        all of them if ``n`` is ``None``
+        """
+        with self._lock:
+            return [(self._values[d], c) for d, c in self._counts.most_common(n)]
+
+
+def _digest(value: Payload) -> str:
+    if isinstance(value, str):
+        return (
+            "str:" + hashlib.sha256(value.encode("utf-8", "surrogatepass")).hexdigest()
+        )
+    return "bytes:" + hashlib.sha256(value).hexdigest()
@@ -1,3 +1,4 @@
+import threading
 import warnings
 from collections import UserList
 from typing import Any, Dict, List, Optional, Set, Union
@@ -85,7 +86,13 @@ class Defaults(BaseAttributes):
 
 
 class Host(InventoryElement):
-    __slots__ = ("name", "connections", "defaults")
+    __slots__ = (
+        "name",
+        "connections",
+        "defaults",
+        "_connections_lock",
+        "_connections_opening",
+    )
 
     def __init__(
         self, name: str, defaults: Optional[Defaults] = None, **kwargs
@@ -93,8 +100,27 @@ class Host(InventoryElement):
         self.name = name
         self.defaults = defaults or Defaults()
         self.connections: Connections = Connections()
+        self._connections_lock = threading.RLock()
+        self._connections_opening: Dict[str, threading.Event] = {}
         super().__init__(**kwargs)
 
+    def __getstate__(self):
+        # connections are bound to the process that opened them so they are not copied
+        state = dict(getattr(self, "__dict__", {}))
+        for cls in type(self).__mro__:
+            for attr in getattr(cls, "__slots__", ()):
+                state[attr] = object.__getattribute__(self, attr)
+        state["connections"] = Connections()
+        del state["_connections_lock"]
+        del state["_connections_opening"]
+        return state
+
+    def __setstate__(self, state):
+        for k, v in state.items():
+            object.__setattr__(self, k, v)
+        object.__setattr__(self, "_connections_lock", threading.RLock())
+        object.__setattr__(self, "_connections_opening", {})
+
     def _resolve_data(self):
         processed = []
         result = {}
@@ -289,9 +315,19 @@ class Host(InventoryElement):
         Returns:
             An already established connection
         """
-        if connection not in self.connections:
-            conn = self.get_connection_parameters(connection)
-            self.open_connection(
+        while True:
+            with self._connections_lock:
+                if connection in self.connections:
+                    return self.connections[connection].connection
+                opening = self._connections_opening.get(connection)
+            if opening is None:
+                break
+            # another thread is opening it, use it once it's open
+            opening.wait()
+
+        conn = self.get_connection_parameters(connection)
+        try:
+            plugin = self.open_connection(
                 connection=connection,
                 configuration=configuration,
                 hostname=conn.hostname,
@@ -301,7 +337,9 @@ class Host(InventoryElement):
                 platform=conn.platform,
                 extras=conn.extras,
             )
-        return self.connections[connection].connection
+        except ConnectionAlreadyOpen:
+            return self.get_connection(connection, configuration)
+        return plugin.connection
 
     def get_connection_state(self, connection: str) -> Dict[str, Any]:
         """
@@ -336,41 +374,68 @@ class Host(InventoryElement):
         Returns:
             An already established connection
         """
-        if connection in self.connections:
-            raise ConnectionAlreadyOpen(connection)
-
-        self.connections[connection] = self.connections.get_plugin(connection)()
-        if default_to_host_attributes:
-            conn_params = self.get_connection_parameters(connection)
-            self.connections[connection].open(
-                hostname=hostname if hostname is not None else conn_params.hostname,
-                username=username if username is not None else conn_params.username,
-                password=password if password is not None else conn_params.password,
-                port=port if port is not None else conn_params.port,
-                platform=platform if platform is not None else conn_params.platform,
-                extras=extras if extras is not None else conn_params.extras,
-                configuration=configuration,
-            )
-        else:
-            self.connections[connection].open(
-                hostname=hostname,
-                username=username,
-                password=password,
-                port=port,
-                platform=platform,
-                extras=extras,
-                configuration=configuration,
-            )
-        return self.connections[connection]
+        # the lock isn't held while the plugin connects so a slow connection can
+        # still be closed, and doesn't block the other connections of the host
+        with self._connections_lock:
+            if (
+                connection in self.connections
+                or connection in self._connections_opening
+            ):
+                raise ConnectionAlreadyOpen(connection)
+            opening = self._connections_opening[connection] = threading.Event()
+
+        try:
+            plugin = self.connections.get_plugin(connection)()
+            if default_to_host_attributes:
+                conn_params = self.get_connection_parameters(connection)
+                plugin.open(
+                    hostname=hostname if hostname is not None else conn_params.hostname,
+                    username=username if username is not None else conn_params.username,
+                    password=password if password is not None else conn_params.password,
+                    port=port if port is not None else conn_params.port,
+                    platform=platform if platform is not None else conn_params.platform,
+                    extras=extras if extras is not None else conn_params.extras,
+                    configuration=configuration,
+                )
+            else:
+                plugin.open(
+                    hostname=hostname,
+                    username=username,
+                    password=password,
+                    port=port,
+                    platform=platform,
+                    extras=extras,
+                    configuration=configuration,
+                )
+            with self._connections_lock:
+                # close_connections was called while connecting
+                closed = self._connections_opening.get(connection) is not opening
+                if not closed:
+                    self.connections[connection] = plugin
+            if closed:
+                plugin.close()
+            return plugin
+        finally:
+            with self._connections_lock:
+                if self._connections_opening.get(connection) is opening:
+                    del self._connections_opening[connection]
+            opening.set()
 
     def close_connection(self, connection: str) -> None:
         """ Close the connection"""
-        if connection not in self.connections:
-            raise ConnectionNotOpen(connection)
+        with self._connections_lock:
+            if connection not in self.connections:
+                raise ConnectionNotOpen(connection)
+            plugin = self.connections.pop(connection)
+        plugin.close()
 
-        self.connections.pop(connection).close()
+    def _close_opening_connections(self) -> None:
+        # connections being opened are closed as soon as they are open
+        with self._connections_lock:
+            self._connections_opening.clear()
 
     def close_connections(self) -> None:
+        self._close_opening_connections()
         # Decouple deleting dictionary elements from iterating over connections dict
         existing_conns = list(self.connections.keys())
         for connection in existing_conns:
@@ -0,0 +1,81 @@
+import pickle
+import sqlite3
+import threading
+from typing import Dict
+
+from nornir.core.task import MultiResult, _detached_copy
+
+
+class Journal(object):
+    """
+    SQLite database where :meth:`nornir.core.Nornir.run` records the results of
+    each host as soon as it completes when it's given a ``resume`` job id, so an
+    interrupted execution can be resumed later on without running again the task
+    on the hosts that already completed.
+
+    Results are stored with :mod:`pickle`. Exceptions that can't be pickled are
+    replaced with a :obj:`nornir.core.exceptions.NornirRemoteError` and any other
+    value that can't be pickled with its ``repr``.
+
+    Arguments:
+        path(``str``): path of the database, it's created if it doesn't exist
+
+    Attributes:
+        path(``str``): path of the database
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "job TEXT NOT NULL, host TEXT NOT NULL, task TEXT NOT NULL, "
+                "result BLOB NOT NULL, PRIMARY KEY (job, host))"
+            )
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, exc_type: object, exc_val: object, exc_tb: object) -> None:
+        self.close()
+
+    def load(self, job: str, task: str) -> Dict[str, MultiResult]:
+        """
+        Return the results recorded for ``job``. Results are not attached to any
+        :obj:`nornir.core.inventory.Host`.
+
+        Raises:
+            :obj:`ValueError`: if ``job`` was recorded for a task other than ``task``
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT host, task, result FROM results WHERE job = ?", (job,)
+            ).fetchall()
+        results = {}
+        for host, recorded_task, result in rows:
+            if recorded_task != task:
+                raise ValueError(
+                    f"job {job!r} was recorded for task {recorded_task!r}, not {task!r}"
+                )
+            results[host] = pickle.loads(result)
+        return results
+
+    def record(self, job: str, task: str, results: MultiResult) -> None:
+        """Record ``results``, the results of a host running ``task``, for ``job``"""
+        data = pickle.dumps(_detached_copy(results))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (job, results.host.name, task, data),
+            )
+
+    def delete(self, job: str) -> None:
+        """Forget the results recorded for ``job``"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results WHERE job = ?", (job,))
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,470 @@
+import collections
+import contextlib
+import logging
+import multiprocessing
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Counter, Dict, Iterator, Optional, Set, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+_worker_of = threading.local()
+
+
+def _process_pool(max_workers: Optional[int]) -> ProcessPoolExecutor:
+    # forked processes could inherit locks held by other threads at the time, like
+    # the ones of the host guard or of logging, and deadlock on them
+    if sys.version_info >= (3, 7):
+        return ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return ProcessPoolExecutor(max_workers=max_workers)
+
+
+class WorkerPool(object):
+    """
+    Pool of worker threads used by :obj:`nornir.core.Nornir` to run tasks.
+
+    The pool is created by the root :obj:`nornir.core.Nornir` object and it's shared
+    by all the objects returned by :meth:`nornir.core.Nornir.filter`. Threads are
+    started on demand and reused across runs until :meth:`close` is called. A closed
+    pool can still be used, new threads will be started the next time work is
+    submitted.
+
+    The pool also manages a pool of worker processes, started the first time
+    :meth:`submit_process` is called, to offload CPU bound work.
+
+    Arguments:
+        num_workers(``int``): maximum number of worker threads
+        num_processes(``int``): maximum number of worker processes, defaults to the
+          number of CPUs
+
+    Attributes:
+        num_workers(``int``): maximum number of worker threads
+        num_processes(``int``): maximum number of worker processes
+    """
+
+    def __init__(self, num_workers: int, num_processes: Optional[int] = None) -> None:
+        self.num_workers = num_workers
+        self.num_processes = num_processes
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()  # type: ignore
+        self._threads: Set[threading.Thread] = set()
+        self._abandoned = 0
+        self._lent = 0
+        self._processes: Optional[ProcessPoolExecutor] = None
+
+    def __len__(self) -> int:
+        return len(self._threads)
+
+    def submit(
+        self, fn: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> "Future[Any]":
+        """
+        Schedule ``fn(*args, **kwargs)`` to be run by a worker thread.
+
+        Returns:
+            :obj:`concurrent.futures.Future`: future tracking the execution of ``fn``
+        """
+        future: "Future[Any]" = Future()
+        with self._lock:
+            self._queue.put((future, fn, args, kwargs))
+            if len(self._threads) < self._capacity():
+                self._start_worker()
+        return future
+
+    @contextlib.contextmanager
+    def lend(self) -> Iterator[None]:
+        """
+        Allow an extra thread while the current one, if it's a worker of the pool,
+        waits for jobs it submitted itself, like the hosts of a run started by a
+        task, so they can't be starved by the jobs waiting for them.
+        """
+        if getattr(_worker_of, "pool", None) is not self:
+            yield
+            return
+        with self._lock:
+            self._lent += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._lent -= 1
+                self._queue.put(None)
+
+    def abandon(self, future: "Future[Any]") -> None:
+        """
+        Give up on a job that is taking too long. Threads can't be interrupted so,
+        to keep the capacity of the pool, an extra thread is allowed until the
+        thread running the job is done with it.
+        """
+        with self._lock:
+            self._abandoned += 1
+        future.add_done_callback(self._release_abandoned)
+
+    def _release_abandoned(self, future: "Future[Any]") -> None:
+        with self._lock:
+            self._abandoned -= 1
+            self._queue.put(None)
+
+    def submit_process(
+        self, fn: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> "Future[Any]":
+        """
+        Schedule ``fn(*args, **kwargs)`` to be run by a worker process. ``fn``, its
+        arguments and its return value must be picklable. Worker processes are
+        spawned, not forked, so ``fn`` has to be importable.
+
+        Returns:
+            :obj:`concurrent.futures.Future`: future tracking the execution of ``fn``
+        """
+        with self._lock:
+            if self._processes is None:
+                self._processes = _process_pool(self.num_processes)
+            processes = self._processes
+        return processes.submit(fn, *args, **kwargs)
+
+    def resize(self, num_workers: int) -> None:
+        """
+        Change the maximum number of worker threads. Idle threads in excess are
+        stopped, busy ones are stopped as soon as they finish their current job.
+        """
+        if num_workers < 1:
+            raise ValueError("num_workers must be greater than 0")
+        with self._lock:
+            self.num_workers = num_workers
+            excess = len(self._threads) - self._capacity()
+            for _ in range(excess):
+                self._queue.put(None)
+
+    def close(self) -> None:
+        """
+        Stop all the worker threads and processes once they are done with the jobs
+        already submitted.
+        """
+        with self._lock:
+            threads, q = self._threads, self._queue
+            self._threads, self._queue = set(), queue.Queue()
+            for _ in threads:
+                q.put(None)
+            processes, self._processes = self._processes, None
+        if processes is not None:
+            processes.shutdown()
+
+    def _start_worker(self) -> None:
+        t = threading.Thread(
+            target=self._worker, args=(self._queue,), name="nornir-worker", daemon=True
+        )
+        self._threads.add(t)
+        t.start()
+
+    def _should_stop(self, thread: threading.Thread) -> bool:
+        with self._lock:
+            if thread not in self._threads:
+                # pool was closed while we were busy
+                return True
+            if len(self._threads) > self._capacity():
+                self._threads.discard(thread)
+                return True
+            return False
+
+    def _capacity(self) -> int:
+        return self.num_workers + self._abandoned + self._lent
+
+    def _worker(self, q: queue.Queue) -> None:  # type: ignore
+        thread = threading.current_thread()
+        _worker_of.pool = self
+        while True:
+            item = q.get()
+            if item is not None:
+                future, fn, args, kwargs = item
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(*args, **kwargs))
+                    except BaseException as e:
+                        future.set_exception(e)
+                # release references so results can be garbage collected
+                del item, future, fn, args, kwargs
+            if self._should_stop(thread):
+                return
+
+
+class Autoscaler(object):
+    """
+    Adjusts the number of hosts to run in parallel based on how the hosts already
+    run are behaving. It's used by :meth:`nornir.core.Nornir.run` when
+    ``num_workers`` is ``"auto"``.
+
+    Every time as many hosts as the current number of workers complete, the
+    number of workers is reduced to three quarters if, during that window, the
+    task failed for more than ``max_error_rate`` of the hosts, the average time
+    to run the task went over ``max_slowdown`` times the best average seen so far
+    or the process was busy, across all threads, more than ``max_cpu`` of the
+    time. Otherwise the number of workers is doubled until the first reduction
+    and increased by one afterwards.
+
+    Arguments:
+        num_workers(``int``): initial number of workers
+        min_workers(``int``): minimum number of workers
+        max_workers(``int``): maximum number of workers
+        max_error_rate(``float``): see above
+        max_slowdown(``float``): see above
+        max_cpu(``float``): see above
+
+    Attributes:
+        num_workers(``int``): current number of workers
+        history(``list``): number of workers after each adjustment, starting with
+          the initial one
+    """
+
+    def __init__(
+        self,
+        num_workers: int,
+        min_workers: int = 1,
+        max_workers: int = 100,
+        max_error_rate: float = 0.1,
+        max_slowdown: float = 2.0,
+        max_cpu: float = 0.9,
+    ) -> None:
+        if not 1 <= min_workers <= max_workers:
+            raise ValueError("min_workers must be between 1 and max_workers")
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.max_error_rate = max_error_rate
+        self.max_slowdown = max_slowdown
+        self.max_cpu = max_cpu
+        self.num_workers = min(max(num_workers, min_workers), max_workers)
+        self.history = [self.num_workers]
+        self._lock = threading.Lock()
+        self._slow_start = True
+        self._best_latency: Optional[float] = None
+        self._reset_window()
+
+    def _reset_window(self) -> None:
+        self._count = 0
+        self._failed = 0
+        self._latency = 0.0
+        self._wall = time.monotonic()
+        self._cpu = time.process_time()
+
+    def observe(self, seconds: float, failed: bool) -> None:
+        """Account for a host that took ``seconds`` to complete"""
+        with self._lock:
+            self._count += 1
+            self._failed += failed
+            self._latency += seconds
+            if self._count < self.num_workers:
+                return
+
+            latency = self._latency / self._count
+            if self._best_latency is None or latency < self._best_latency:
+                self._best_latency = latency
+            elapsed = time.monotonic() - self._wall
+            cpu = (time.process_time() - self._cpu) / elapsed if elapsed else 0
+
+            if (
+                self._failed > self.max_error_rate * self._count
+                or latency > self.max_slowdown * self._best_latency
+                or cpu > self.max_cpu
+            ):
+                self._slow_start = False
+                num_workers = self.num_workers * 3 // 4
+            elif self._slow_start:
+                num_workers = self.num_workers * 2
+            else:
+                num_workers = self.num_workers + 1
+            num_workers = min(max(num_workers, self.min_workers), self.max_workers)
+
+            if num_workers != self.num_workers:
+                logger.info(
+                    "Adjusting num_workers from %d to %d (latency: %.3fs, "
+                    "failed: %d/%d, cpu: %.0f%%)",
+                    self.num_workers,
+                    num_workers,
+                    latency,
+                    self._failed,
+                    self._count,
+                    cpu * 100,
+                )
+                self.num_workers = num_workers
+                self.history.append(num_workers)
+            self._reset_window()
+
+
+class HostGuard(object):
+    """
+    Keeps track of the hosts being run so two runs don't use the same host, and its
+    connections, at the same time.
+
+    Every run belongs to a job: runs started by a task belong to the job of the run
+    the task is part of, other runs start a new job. Runs of the same job share the
+    hosts, as a task waiting for the run it started may be holding hosts that run
+    needs, and only runs of different jobs wait for each other. A run started by a
+    task doesn't wait for a job that is itself waiting, directly or not, for the
+    job of the task as neither would ever complete, the host is shared instead.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._busy: Dict[int, Tuple["Future[None]", "Counter[object]"]] = {}
+        self._waits: Dict[object, Tuple[object, Set[object]]] = {}
+        self._local = threading.local()
+
+    def job(self) -> Optional[object]:
+        """Job of the task the current thread is running, if any"""
+        return getattr(self._local, "job", None)
+
+    def acquire(
+        self, host: Any, job: object, waiter: Optional[object] = None
+    ) -> "Optional[Future[None]]":
+        """
+        Try to acquire ``host`` for a run of ``job``. If ``host`` is busy and the
+        current thread is running a task of ``job``, ``job`` is recorded as waiting
+        for the job holding ``host`` until :meth:`done_waiting` is called with
+        ``waiter``.
+
+        Returns:
+            ``None`` if ``host`` was acquired, otherwise a
+            :obj:`concurrent.futures.Future` completed once ``host`` is released
+        """
+        key = id(host)
+        with self._lock:
+            busy = self._busy.get(key)
+            if busy is None:
+                self._busy[key] = busy = (Future(), collections.Counter())
+            future, holders = busy
+            if not holders or job in holders:
+                holders[job] += 1
+                return None
+            if any(self._waits_for(h, job) for h in holders):
+                logger.warning(
+                    "Host %r: shared with another run to avoid a deadlock",
+                    getattr(host, "name", host),
+                )
+                holders[job] += 1
+                return None
+            if waiter is not None and self.job() is job:
+                self._waits.setdefault(waiter, (job, set()))[1].update(holders)
+            return future
+
+    def done_waiting(self, waiter: object) -> None:
+        """Forget the jobs recorded as waited for by ``waiter``"""
+        with self._lock:
+            self._waits.pop(waiter, None)
+
+    def release(self, host: Any, job: object) -> None:
+        """Release ``host``, previously acquired for ``job`` with :meth:`acquire`"""
+        key = id(host)
+        with self._lock:
+            future, holders = self._busy[key]
+            holders[job] -= 1
+            if holders[job]:
+                return
+            del holders[job]
+            if holders:
+                return
+            del self._busy[key]
+        future.set_result(None)
+
+    @contextlib.contextmanager
+    def running(self, job: object) -> Iterator[None]:
+        """Mark the current thread as running a task of ``job``"""
+        previous = self.job()
+        self._local.job = job
+        try:
+            yield
+        finally:
+            self._local.job = previous
+
+    @contextlib.contextmanager
+    def hold(self, host: Any, job: object) -> Iterator[None]:
+        """
+        Wait until ``host`` can be acquired for ``job`` and run it in the current
+        thread
+        """
+        waiter = object()
+        try:
+            busy = self.acquire(host, job, waiter)
+            while busy:
+                busy.result()
+                self.done_waiting(waiter)
+                busy = self.acquire(host, job, waiter)
+        finally:
+            self.done_waiting(waiter)
+        try:
+            with self.running(job):
+                yield
+        finally:
+            self.release(host, job)
+
+    def _waits_for(self, job: object, other: object) -> bool:
+        # whether ``job`` waits, directly or not, for ``other``
+        seen: Set[object] = set()
+        todo = [job]
+        while todo:
+            current = todo.pop()
+            if current is other:
+                return True
+            if current in seen:
+                continue
+            seen.add(current)
+            for waiting, jobs in self._waits.values():
+                if waiting is current:
+                    todo.extend(jobs)
+        return False
+
+
+_host_guard = HostGuard()
+
+
+class RunHandle(object):
+    """
+    Handle to a run started with :meth:`nornir.core.Nornir.submit`.
+
+    Attributes:
+        future (:obj:`concurrent.futures.Future`): future tracking the run
+        cancel_event (:obj:`threading.Event`): event set when the run is cancelled
+    """
+
+    def __init__(self) -> None:
+        self.future: "Future[Any]" = Future()
+        self.cancel_event = threading.Event()
+
+    def done(self) -> bool:
+        """Whether the run is over or not"""
+        return self.future.done()
+
+    def cancel(self) -> bool:
+        """
+        Stop starting hosts. Hosts already running are allowed to complete and the
+        ones that didn't start are reported as skipped in the result of the run.
+
+        Returns:
+            ``False`` if the run was already over, ``True`` otherwise
+        """
+        if self.future.done():
+            return False
+        self.cancel_event.set()
+        return True
+
+    def cancelled(self) -> bool:
+        """Whether :meth:`cancel` was called before the run was over"""
+        return self.cancel_event.is_set()
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """
+        Wait for the run to complete and return its result.
+
+        Raises:
+            :obj:`concurrent.futures.TimeoutError`: if the run isn't over after
+              ``timeout`` seconds
+            :obj:`nornir.core.exceptions.NornirExecutionError`: if the run raised it
+
+        Returns:
+            :obj:`nornir.core.task.AggregatedResult`: results of each execution
+        """
+        return self.future.result(timeout)
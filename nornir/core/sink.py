@@ -0,0 +1,192 @@
+import json
+import pickle
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Union
+
+from nornir.core.inventory import Host
+from nornir.core.spill import SpilledText
+from nornir.core.task import MultiResult, Result, _attach_results, _detached_copy
+
+
+class ResultSink(ABC):
+    """
+    Sinks store the results of each host as soon as it completes when given to
+    :meth:`nornir.core.Nornir.run` so they don't have to be kept in memory until
+    the end of the execution. They have to inherit from this class and provide
+    implementations for :meth:`write` and :meth:`read`.
+    """
+
+    @abstractmethod
+    def write(self, results: MultiResult) -> Any:
+        """Store ``results`` and return a reference to read them back"""
+        pass
+
+    @abstractmethod
+    def read(self, ref: Any) -> MultiResult:
+        """
+        Return the results stored under ``ref``, not attached to any
+        :obj:`nornir.core.inventory.Host`
+        """
+        pass
+
+    def close(self) -> None:
+        """Release the resources used by the sink"""
+        pass
+
+    def __enter__(self) -> "ResultSink":
+        return self
+
+    def __exit__(self, exc_type: object, exc_val: object, exc_tb: object) -> None:
+        self.close()
+
+
+class ResultSummary(object):
+    """
+    What :meth:`nornir.core.Nornir.run` keeps in memory about the results of a host
+    when they are sent to a :obj:`ResultSink`.
+
+    Attributes:
+        host (:obj:`nornir.core.inventory.Host`): host the results belong to
+        name (``str``): name of the task
+        failed (``bool``): whether the task failed
+        changed (``bool``): whether the task changed the system
+        skipped (``bool``): whether the host didn't run the task
+        ref: reference of the results in the sink
+        sink (:obj:`ResultSink`): sink the results are stored in
+    """
+
+    __slots__ = ("host", "name", "failed", "changed", "skipped", "ref", "sink")
+
+    def __init__(self, host: Host, results: MultiResult, sink: ResultSink) -> None:
+        self.host = host
+        self.name = results.name
+        self.failed = results.failed
+        self.changed = results.changed
+        self.skipped = getattr(results, "skipped", False)
+        self.ref = sink.write(results)
+        self.sink = sink
+
+    def __repr__(self) -> str:
+        return "{}: {!r}".format(self.__class__.__name__, self.name)
+
+    def __iter__(self) -> Iterator[Result]:
+        return iter(self.load())
+
+    def load(self) -> MultiResult:
+        """Read the results from the sink"""
+        return _attach_results(self.sink.read(self.ref), self.host)
+
+
+class JSONLSink(ResultSink):
+    """
+    Writes the results of each host as a line of JSON to a file. Values that can't
+    be represented with JSON, like exceptions, are replaced with their ``repr``.
+
+    Arguments:
+        path(``str``): file to write to, results are appended to it if it exists
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "ab+")
+
+    def write(self, results: MultiResult) -> int:
+        host = results[0].host
+        line = {
+            "host": host.name if host else None,
+            "name": results.name,
+            "failed": results.failed,
+            "changed": results.changed,
+            "results": _to_json(results),
+        }
+        data = json.dumps(line, default=_json_default).encode() + b"\n"
+        with self._lock:
+            self._file.seek(0, 2)
+            ref = self._file.tell()
+            self._file.write(data)
+            self._file.flush()
+        return ref
+
+    def read(self, ref: int) -> MultiResult:
+        with self._lock:
+            self._file.seek(ref)
+            line = json.loads(self._file.readline())
+        return _from_json(line["name"], line["results"])
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class SQLiteSink(ResultSink):
+    """
+    Stores the results in an SQLite database with :mod:`pickle`, like
+    :obj:`nornir.core.journal.Journal` does.
+
+    Arguments:
+        path(``str``): path of the database, it's created if it doesn't exist
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "id INTEGER PRIMARY KEY, host TEXT, result BLOB NOT NULL)"
+            )
+
+    def write(self, results: MultiResult) -> int:
+        host = results[0].host
+        data = pickle.dumps(_detached_copy(results))
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO results (host, result) VALUES (?, ?)",
+                (host.name if host else None, data),
+            )
+        ref = cursor.lastrowid
+        assert ref is not None
+        return ref
+
+    def read(self, ref: int) -> MultiResult:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM results WHERE id = ?", (ref,)
+            ).fetchone()
+        results: MultiResult = pickle.loads(row[0])
+        return results
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _json_default(value: Any) -> str:
+    return str(value) if isinstance(value, SpilledText) else repr(value)
+
+
+def _to_json(results: MultiResult) -> List[Dict[str, Any]]:
+    data: List[Dict[str, Any]] = []
+    for r in results:
+        if isinstance(r, MultiResult):
+            data.append({"name": r.name, "results": _to_json(r)})
+        else:
+            state = r.__getstate__()
+            del state["host"]
+            data.append(state)
+    return data
+
+
+def _from_json(name: str, data: List[Dict[str, Any]]) -> MultiResult:
+    results = MultiResult(name)
+    for d in data:
+        r: Union[Result, MultiResult]
+        if "results" in d and "failed" not in d:
+            r = _from_json(d["name"], d["results"])
+        else:
+            r = Result(None, **d)  # type: ignore
+        results.append(r)
+    return results
@@ -0,0 +1,219 @@
+import os
+import tempfile
+import threading
+from typing import IO, Any, Iterator, Optional, Union
+
+
+class _SpillFile(object):
+    # temporary file shared by the SpilledText objects of a process, so they don't
+    # keep a file descriptor open each. It's closed once none of them is alive
+
+    def __init__(self) -> None:
+        self.pid = os.getpid()
+        self.alive = 0
+        self._lock = threading.Lock()
+        self._file: IO[bytes] = tempfile.TemporaryFile()
+        self._size = 0
+
+    def write(self, data: bytes) -> int:
+        with self._lock:
+            offset = self._size
+            self._file.seek(offset)
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data)
+        return offset
+
+    def read(self, offset: int, size: int) -> bytes:
+        if hasattr(os, "pread"):
+            return os.pread(self._file.fileno(), size, offset)
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.read(size)
+
+    def release(self) -> None:
+        with _spill_file_lock:
+            self.alive -= 1
+            if not self.alive:
+                self._file.close()
+
+
+_spill_file: Optional[_SpillFile] = None
+_spill_file_lock = threading.Lock()
+# size in bytes after which new texts go to a new file, so a long lived text doesn't
+# keep the space of the ones written after it in use
+_spill_file_size = 64 << 20
+
+
+def _get_spill_file() -> _SpillFile:
+    global _spill_file
+    with _spill_file_lock:
+        # forked processes get their own file as the offsets of the parent would be
+        # shared with them otherwise
+        if (
+            _spill_file is None
+            or not _spill_file.alive
+            or _spill_file.pid != os.getpid()
+            or _spill_file._size >= _spill_file_size
+        ):
+            _spill_file = _SpillFile()
+        _spill_file.alive += 1
+        return _spill_file
+
+
+class SpilledText(object):
+    """
+    Read-only string kept in a temporary file instead of in memory. Results whose
+    ``result``, ``stdout`` or ``diff`` strings are longer than
+    ``config.core.spill_threshold`` characters get them replaced with objects of
+    this class, so a few huge outputs don't exhaust the memory of the runner.
+    Results are replaced once the host is done with the task, so the results of
+    subtasks are plain strings for the rest of the task.
+
+    It behaves like the original string: ``str()`` returns it, indexing and
+    slicing read only the part requested and string methods like ``splitlines``
+    work on it. Use :meth:`chunks` or :meth:`lines` to go through it without
+    loading it at once. When pickled or deep copied it turns into a plain string.
+
+    The objects of a process share temporary files of up to 64MB, which are
+    deleted once all the objects in them are garbage collected or :meth:`close` is
+    called on them.
+
+    Arguments:
+        text (``str``): string to keep in the temporary file
+    """
+
+    __slots__ = ("_store", "_offset", "_len", "_width", "_encoding")
+
+    def __init__(self, text: str) -> None:
+        try:
+            data = text.encode("ascii")
+            self._width, self._encoding = 1, "ascii"
+        except UnicodeEncodeError:
+            # a fixed width encoding keeps slicing a matter of offsets
+            data = text.encode("utf-32-le")
+            self._width, self._encoding = 4, "utf-32-le"
+        self._len = len(text)
+        self._store: Optional[_SpillFile] = _get_spill_file()
+        self._offset = self._store.write(data)
+
+    def __del__(self) -> None:
+        self.close()
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(str(self), name)
+
+    def __str__(self) -> str:
+        return self._read(0, self._len)
+
+    def __repr__(self) -> str:
+        return "<{}: {} characters>".format(self.__class__.__name__, self._len)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __bool__(self) -> bool:
+        return self._len > 0
+
+    def __getitem__(self, key: Union[int, slice]) -> str:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._len)
+            if step != 1:
+                return str(self)[key]
+            return self._read(start, max(start, stop))
+        if key < 0:
+            key += self._len
+        if not 0 <= key < self._len:
+            raise IndexError("string index out of range")
+        return self._read(key, key + 1)
+
+    def __iter__(self) -> Iterator[str]:
+        for chunk in self.chunks():
+            yield from chunk
+
+    def __contains__(self, sub: str) -> bool:
+        if not sub:
+            return True
+        tail = ""
+        for chunk in self.chunks():
+            window = tail + chunk
+            if sub in window:
+                return True
+            tail = window[len(window) - len(sub) + 1 :] if len(sub) > 1 else ""
+        return False
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SpilledText):
+            other = str(other)
+        if not isinstance(other, str):
+            return NotImplemented
+        if len(other) != self._len:
+            return False
+        position = 0
+        for chunk in self.chunks():
+            if chunk != other[position : position + len(chunk)]:
+                return False
+            position += len(chunk)
+        return True
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __add__(self, other: str) -> str:
+        return str(self) + other
+
+    def __radd__(self, other: str) -> str:
+        return other + str(self)
+
+    def __copy__(self) -> "SpilledText":
+        return self
+
+    def __deepcopy__(self, memo: Any) -> str:
+        return str(self)
+
+    def __reduce__(self) -> Any:
+        return str, (str(self),)
+
+    def _read(self, start: int, stop: int) -> str:
+        if self._store is None:
+            raise ValueError("SpilledText is closed")
+        data = self._store.read(
+            self._offset + start * self._width, (stop - start) * self._width
+        )
+        return data.decode(self._encoding)
+
+    def chunks(self, size: int = 1 << 20) -> Iterator[str]:
+        """Yield the string in pieces of ``size`` characters"""
+        for start in range(0, self._len, size):
+            yield self._read(start, min(start + size, self._len))
+
+    def lines(self) -> Iterator[str]:
+        """Yield the lines of the string, including the line breaks"""
+        pending = ""
+        for chunk in self.chunks():
+            lines = (pending + chunk).splitlines(True)
+            pending = lines.pop() if lines else ""
+            yield from lines
+        if pending:
+            yield pending
+
+    def close(self) -> None:
+        """Stop using the temporary file, the object can't be used anymore"""
+        store, self._store = getattr(self, "_store", None), None
+        if store is not None:
+            store.release()
+
+
+def _spill(result: Any, threshold: int) -> None:
+    # results of subtasks are only spilled with the rest of the results of the
+    # host so the tasks that follow them in the same task get plain strings
+    if isinstance(result, list):
+        for r in result:
+            _spill(r, threshold)
+        return
+    for attr in ("result", "stdout", "diff"):
+        value = getattr(result, attr, None)
+        if isinstance(value, str) and len(value) > threshold:
+            setattr(result, attr, SpilledText(value))
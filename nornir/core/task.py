@@ -1,17 +1,94 @@
+import asyncio
+import copy
+import functools
 import logging
+import pickle
+import random
+import time
 import traceback
-from typing import Any, Optional, TYPE_CHECKING
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple, Type, Union
 
 from nornir.core.exceptions import NornirExecutionError
+from nornir.core.exceptions import NornirRemoteError
 from nornir.core.exceptions import NornirSubTaskError
-
-if TYPE_CHECKING:
-    from nornir.core.inventory import Host
+from nornir.core.intern import PayloadStore
+from nornir.core.inventory import Host
+from nornir.core.pool import _host_guard
 
 
 logger = logging.getLogger(__name__)
 
 
+class Retry(object):
+    """
+    Retry policy of a task. When the task raises one of ``exceptions``, or one of
+    its subtasks does, the connections of the host are closed and the task is run
+    again after a delay, within the worker running the host, until it succeeds or
+    runs out of attempts. For instance:
+
+        nr.run(
+            task=netmiko_send_command,
+            command_string="show version",
+            retry=Retry(attempts=3, exceptions=(ConnectionResetError,)),
+        )
+
+    The delay before the ``n``-th retry is ``backoff * factor ** (n - 1)``
+    seconds, capped at ``max_backoff`` and increased by up to ``jitter`` times
+    itself at random so hosts failing at the same time don't retry at once.
+
+    Arguments:
+        attempts (``int``): maximum number of times to run the task, including
+          the first one
+        backoff (``float``): seconds to wait before the first retry
+        factor (``float``): how much the delay grows after each retry
+        max_backoff (``float``): maximum number of seconds to wait
+        jitter (``float``): maximum random increase of the delay, as a fraction
+          of it
+        exceptions (``tuple``): exception types to retry on
+    """
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        backoff: float = 1.0,
+        factor: float = 2.0,
+        max_backoff: float = 60.0,
+        jitter: float = 0.1,
+        exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+    ) -> None:
+        if attempts < 1:
+            raise ValueError("attempts has to be at least 1")
+        self.attempts = attempts
+        self.backoff = backoff
+        self.factor = factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.exceptions = exceptions
+
+    def __repr__(self) -> str:
+        return "{}(attempts={}, backoff={}, exceptions={})".format(
+            self.__class__.__name__, self.attempts, self.backoff, self.exceptions
+        )
+
+    def delay(self, attempt: int) -> float:
+        """Number of seconds to wait after ``attempt`` failed"""
+        delay = min(self.backoff * self.factor ** (attempt - 1), self.max_backoff)
+        return delay * (1 + random.uniform(0, self.jitter))
+
+    def should_retry(self, exc: BaseException, attempt: int) -> bool:
+        """Whether to run the task again after ``attempt`` failed with ``exc``"""
+        if attempt >= self.attempts:
+            return False
+        while isinstance(exc, NornirSubTaskError):
+            failed = [r for r in exc.result if getattr(r, "exception", None)]
+            if not failed:
+                return False
+            exc = failed[0].exception
+        return isinstance(exc, self.exceptions)
+
+
 class Task(object):
     """
     A task is basically a wrapper around a function that has to be run against multiple devices.
@@ -22,6 +99,7 @@ class Task(object):
         task (callable): function or callable we will be calling
         name (``string``): name of task, defaults to ``task.__name__``
         severity_level (logging.LEVEL): Severity level associated to the task
+        retry (:obj:`Retry`): Retry policy of the task, by default it's not retried
         **kwargs: Parameters that will be passed to the ``task``
 
     Attributes:
@@ -34,14 +112,20 @@ class Task(object):
         nornir(:obj:`nornir.core.Nornir`): Populated right before calling
           the ``task``
         severity_level (logging.LEVEL): Severity level associated to the task
+        retry (:obj:`Retry`): Retry policy of the task
     """
 
-    def __init__(self, task, name=None, severity_level=logging.INFO, **kwargs):
+    def __init__(
+        self, task, name=None, severity_level=logging.INFO, retry=None, **kwargs
+    ):
         self.name = name or task.__name__
         self.task = task
         self.params = kwargs
         self.results = MultiResult(self.name)
         self.severity_level = severity_level
+        self.retry = retry
+        # job of the run_async the task is part of, see HostGuard
+        self._job = None
 
     def __repr__(self):
         return self.name
@@ -62,32 +146,103 @@ class Task(object):
         self.host = host
         self.nornir = nornir
 
-        try:
-            logger.debug("Host %r: running task %r", self.host.name, self.name)
-            r = self.task(self, **self.params)
-            if not isinstance(r, Result):
-                r = Result(host=host, result=r)
-
-        except NornirSubTaskError as e:
-            tb = traceback.format_exc()
-            logger.error(
-                "Host %r: task %r failed with traceback:\n%s",
-                self.host.name,
-                self.name,
-                tb,
-            )
-            r = Result(host, exception=e, result=str(e), failed=True)
-
-        except Exception as e:
-            tb = traceback.format_exc()
-            logger.error(
-                "Host %r: task %r failed with traceback:\n%s",
-                self.host.name,
-                self.name,
-                tb,
-            )
-            r = Result(host, exception=e, result=tb, failed=True)
+        attempt = 1
+        while True:
+            try:
+                logger.debug("Host %r: running task %r", self.host.name, self.name)
+                r = self.task(self, **self.params)
+                if not isinstance(r, Result):
+                    r = Result(host=host, result=r)
+
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    r = self._failed_result(e)
+                else:
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+            return self._process_result(r)
+
+    async def start_async(self, host, nornir):
+        """
+        Same as :meth:`start` but for use within an ``asyncio`` event loop. If the
+        ``task`` is a coroutine function it's awaited directly, otherwise it's run
+        in the default executor of the event loop so it doesn't block it.
+
+        Arguments:
+            host (:obj:`nornir.core.inventory.Host`): Host we are operating with. Populated right
+              before calling the ``task``
+            nornir(:obj:`nornir.core.Nornir`): Populated right before calling
+              the ``task``
+
+        Returns:
+            host (:obj:`nornir.core.task.MultiResult`): Results of the task and its subtasks
+        """
+        self.host = host
+        self.nornir = nornir
+
+        attempt = 1
+        while True:
+            try:
+                logger.debug("Host %r: running task %r", self.host.name, self.name)
+                if asyncio.iscoroutinefunction(self.task):
+                    r = await self.task(self, **self.params)
+                else:
+                    loop = asyncio.get_event_loop()
+                    r = await loop.run_in_executor(None, self._run_in_job)
+                if not isinstance(r, Result):
+                    r = Result(host=host, result=r)
+
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    r = self._failed_result(e)
+                else:
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+            return self._process_result(r)
+
+    def _run_in_job(self):
+        with _host_guard.running(self._job):
+            return self.task(self, **self.params)
+
+    def _retry_delay(self, exc, attempt):
+        """
+        Prepare to run the task again if ``exc`` has to be retried, discarding the
+        results of the subtasks and closing the connections of the host.
+
+        Returns:
+            ``float``: seconds to wait before the next attempt, ``None`` if the task
+            doesn't have to be retried
+        """
+        if not self.retry or not self.retry.should_retry(exc, attempt):
+            return None
+        delay = self.retry.delay(attempt)
+        logger.warning(
+            "Host %r: task %r failed on attempt %d of %d, retrying in %.1fs: %s",
+            self.host.name,
+            self.name,
+            attempt,
+            self.retry.attempts,
+            delay,
+            exc,
+        )
+        self.results = MultiResult(self.name)
+        _close_connections(self.host)
+        return delay
 
+    def _failed_result(self, exc):
+        tb = traceback.format_exc()
+        logger.error(
+            "Host %r: task %r failed with traceback:\n%s", self.host.name, self.name, tb
+        )
+        if isinstance(exc, NornirSubTaskError):
+            return Result(self.host, exception=exc, result=str(exc), failed=True)
+        return Result(self.host, exception=exc, result=tb, failed=True)
+
+    def _process_result(self, r):
         r.name = self.name
         r.severity_level = logging.ERROR if r.failed else self.severity_level
 
@@ -125,6 +280,142 @@ class Task(object):
 
         return r
 
+    async def run_async(self, task, **kwargs):
+        """
+        Same as :meth:`run` but to be awaited from within a coroutine task. For instance:
+
+            async def grouped_tasks(task):
+                await task.run_async(my_first_task)
+                await task.run_async(my_second_task)
+
+            await nornir.run_async(grouped_tasks)
+        """
+        if not self.host or not self.nornir:
+            msg = (
+                "You have to call this after setting host and nornir attributes. ",
+                "You probably called this from outside a nested task",
+            )
+            raise Exception(msg)
+
+        if "severity_level" not in kwargs:
+            kwargs["severity_level"] = self.severity_level
+        task = Task(task, **kwargs)
+        task._job = self._job
+        r = await task.start_async(self.host, self.nornir)
+        self.results.append(r[0] if len(r) == 1 else r)
+
+        if r.failed:
+            # Without this we will keep running the grouped task
+            raise NornirSubTaskError(task=task, result=r)
+
+        return r
+
+    def run_parallel(self, tasks, num_workers=None, share_connections=False):
+        """
+        This is a utility method to run independent subtasks concurrently for the
+        host in the current thread. For instance:
+
+            def grouped_tasks(task):
+                task.run_parallel(
+                    [
+                        (napalm_get, {"getters": ["facts"]}),
+                        (napalm_get, {"getters": ["interfaces"]}),
+                        (napalm_get, {"getters": ["bgp_neighbors"]}),
+                    ]
+                )
+
+            nornir.run(grouped_tasks)
+
+        The first subtask uses the connections of the host while the rest use their
+        own connections, opened when the subtask asks for them and closed when it
+        completes, so connections are never used by two subtasks at the same time.
+        If the connections can be used concurrently, set ``share_connections``
+        so all the subtasks use the connections of the host.
+
+        Subtasks are run until completion even if some of them fail. Results are
+        added in the same order as ``tasks`` and then, if any subtask failed,
+        :obj:`nornir.core.exceptions.NornirSubTaskError` is raised as in :meth:`run`.
+
+        Arguments:
+            tasks: list of tasks, or tuples of task and the arguments to pass to
+              :meth:`run` for that task
+            num_workers(``int``): maximum number of subtasks to run at the same time,
+              defaults to all of them
+            share_connections(``bool``): whether all the subtasks use the
+              connections of the host or not
+
+        Returns:
+            ``list`` of :obj:`nornir.core.task.MultiResult`: results of each subtask
+        """
+        if not self.host or not self.nornir:
+            msg = (
+                "You have to call this after setting host and nornir attributes. ",
+                "You probably called this from outside a nested task",
+            )
+            raise Exception(msg)
+
+        subtasks = []
+        for t in tasks:
+            task, kwargs = (t, {}) if callable(t) else t
+            kwargs = dict(kwargs)
+            if "severity_level" not in kwargs:
+                kwargs["severity_level"] = self.severity_level
+            subtasks.append(Task(task, **kwargs))
+        if not subtasks:
+            return []
+
+        job = _host_guard.job()
+
+        def start(subtask, host):
+            with _host_guard.running(job):
+                try:
+                    return _attach_results(subtask.start(host, self.nornir), self.host)
+                finally:
+                    if host is not self.host:
+                        _close_connections(host)
+
+        with ThreadPoolExecutor(max_workers=num_workers or len(subtasks)) as executor:
+            futures = [
+                executor.submit(
+                    start,
+                    subtask,
+                    self.host if share_connections or i == 0 else copy.copy(self.host),
+                )
+                for i, subtask in enumerate(subtasks)
+            ]
+            results = [f.result() for f in futures]
+
+        for r in results:
+            self.results.append(r[0] if len(r) == 1 else r)
+        for subtask, r in zip(subtasks, results):
+            if r.failed:
+                raise NornirSubTaskError(task=subtask, result=r)
+        return results
+
+    def run_in_process(self, fn, **kwargs):
+        """
+        This is a utility method to offload CPU bound work, like parsing or rendering
+        big outputs, to a pool of worker processes from within a task. For instance:
+
+            def parse_config(host, config):
+                return my_parser(config)
+
+            def grouped_tasks(task):
+                r = task.run(my_task_to_get_config)
+                task.run_in_process(parse_config, config=r.result)
+
+            nornir.run(grouped_tasks)
+
+        ``fn`` is called as ``fn(host, **kwargs)`` where ``host`` is a copy of the
+        :obj:`nornir.core.inventory.Host` with all the data inherited from its groups
+        and without connections. ``fn`` has to be importable from the worker
+        processes and both its arguments and its return value must be picklable.
+
+        Results are handled as in :meth:`run`.
+        """
+        name = kwargs.pop("name", None) or fn.__name__
+        return self.run(functools.partial(_run_in_process, fn), name=name, **kwargs)
+
     def is_dry_run(self, override: bool = None) -> bool:
         """
         Returns whether current task is a dry_run or not.
@@ -132,6 +423,40 @@ class Task(object):
         return override if override is not None else self.nornir.data.dry_run
 
 
+def _host_snapshot(host):
+    return Host(
+        name=host.name,
+        hostname=host.hostname,
+        port=host.port,
+        username=host.username,
+        password=host.password,
+        platform=host.platform,
+        data=dict(host.items()),
+    )
+
+
+def _close_connections(host):
+    host._close_opening_connections()
+    for connection in list(host.connections):
+        try:
+            host.close_connection(connection)
+        except Exception:
+            logger.warning(
+                "Host %r: failed to close connection %r",
+                host.name,
+                connection,
+                exc_info=True,
+            )
+
+
+def _run_in_process(fn, task, **kwargs):
+    future = task.nornir.pool.submit_process(fn, _host_snapshot(task.host), **kwargs)
+    r = future.result()
+    if isinstance(r, Result):
+        r.host = task.host
+    return r
+
+
 class Result(object):
     """
     Result of running individual tasks.
@@ -144,6 +469,8 @@ class Result(object):
         failed (bool): Whether the execution failed or not
         severity_level (logging.LEVEL): Severity level associated to the result of the excecution
         exception (Exception): uncaught exception thrown during the exection of the task (if any)
+        **kwargs: Additional attributes to set. They are kept in a ``dict`` created
+          only if needed, so results without them only take the memory of their slots
 
     Attributes:
         changed (bool): ``True`` if the task is changing the system
@@ -155,6 +482,25 @@ class Result(object):
         exception (Exception): uncaught exception thrown during the exection of the task (if any)
     """
 
+    __slots__ = (
+        "result",
+        "host",
+        "changed",
+        "diff",
+        "failed",
+        "exception",
+        "name",
+        "severity_level",
+        "stdout",
+        "stderr",
+        "_extras",
+    )
+    _slot_names = frozenset(__slots__)
+
+    _extras: Optional[Dict[str, Any]]
+    stdout: Optional[str]
+    stderr: Optional[str]
+
     def __init__(
         self,
         host: "Host",
@@ -166,21 +512,65 @@ class Result(object):
         severity_level: int = logging.INFO,
         **kwargs: Any
     ):
-        self.result = result
-        self.host = host
-        self.changed = changed
-        self.diff = diff
-        self.failed = failed
-        self.exception = exception
-        self.name = None
-        self.severity_level = severity_level
-
-        self.stdout: Optional[str] = None
-        self.stderr: Optional[str] = None
+        # slots are set with their descriptors, going through __setattr__, or even
+        # object.__setattr__, makes creating the tens of thousands of results of
+        # big runs noticeably slower
+        _set_extras(self, None)
+        _set_result(self, result)
+        _set_host(self, host)
+        _set_changed(self, changed)
+        _set_diff(self, diff)
+        _set_failed(self, failed)
+        _set_exception(self, exception)
+        _set_name(self, None)
+        _set_severity_level(self, severity_level)
+
+        _set_stdout(self, None)
+        _set_stderr(self, None)
 
         for k, v in kwargs.items():
             setattr(self, k, v)
 
+    def __getattr__(self, name):
+        if name != "_extras" and self._extras and name in self._extras:
+            return self._extras[name]
+        raise AttributeError(
+            "{!r} object has no attribute {!r}".format(self.__class__.__name__, name)
+        )
+
+    def __setattr__(self, name, value):
+        if name in self._slot_names:
+            object.__setattr__(self, name, value)
+            return
+        try:
+            object.__setattr__(self, name, value)
+        except AttributeError:
+            if self._extras is None:
+                object.__setattr__(self, "_extras", {})
+            self._extras[name] = value
+
+    def __delattr__(self, name):
+        try:
+            object.__delattr__(self, name)
+        except AttributeError:
+            if not self._extras or name not in self._extras:
+                raise
+            del self._extras[name]
+
+    def __getstate__(self):
+        state = dict(getattr(self, "__dict__", {}))
+        for cls in type(self).__mro__:
+            for attr in getattr(cls, "__slots__", ()):
+                if attr != "_extras" and hasattr(self, attr):
+                    state[attr] = object.__getattribute__(self, attr)
+        state.update(self._extras or {})
+        return state
+
+    def __setstate__(self, state):
+        object.__setattr__(self, "_extras", None)
+        for k, v in state.items():
+            setattr(self, k, v)
+
     def __repr__(self):
         return '{}: "{}"'.format(self.__class__.__name__, self.name)
 
@@ -192,15 +582,115 @@ class Result(object):
             return str(self.result)
 
 
+_set_extras = Result._extras.__set__
+_set_result = Result.result.__set__
+_set_host = Result.host.__set__
+_set_changed = Result.changed.__set__
+_set_diff = Result.diff.__set__
+_set_failed = Result.failed.__set__
+_set_exception = Result.exception.__set__
+_set_name = Result.name.__set__
+_set_severity_level = Result.severity_level.__set__
+_set_stdout = Result.stdout.__set__
+_set_stderr = Result.stderr.__set__
+
+
 class AggregatedResult(dict):
     """
     It basically is a dict-like object that aggregates the results for all devices.
     You can access each individual result by doing ``my_aggr_result["hostname_of_device"]``.
+
+    The hosts that failed or changed the system and the number of results with
+    each severity level are kept up to date as hosts are added and removed, so
+    checking them doesn't go through all the results. Call :meth:`reindex` if the
+    results of a host are modified after it's added.
+
+    Attributes:
+        stats (``dict``): information about the execution, for instance the number
+          of workers used when running with ``num_workers="auto"``
+        payloads (:obj:`nornir.core.intern.PayloadStore`): store the payloads of
+          the results were interned into, if any, see :meth:`intern`
     """
 
-    def __init__(self, name, **kwargs):
+    # indexes are set at class level too as unpickling adds the hosts before
+    # restoring the attributes of the instance
+    _failed = None
+    _changed = None
+    _severities = None
+
+    def __init__(self, name: str, **kwargs: Any) -> None:
         self.name = name
-        super().__init__(**kwargs)
+        self.stats = {}
+        self.payloads = None
+        self.reindex()
+        self.update(kwargs)
+
+    def __getstate__(self):
+        return {k: v for k, v in self.__dict__.items() if k not in _INDEXES}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.reindex()
+
+    def __setitem__(self, host, results):
+        if host in self:
+            self._index(host, self[host], -1)
+        super().__setitem__(host, results)
+        self._index(host, results, 1)
+
+    def __delitem__(self, host):
+        results = self[host]
+        super().__delitem__(host)
+        self._index(host, results, -1)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def pop(self, host, *args):
+        if host not in self:
+            return super().pop(host, *args)
+        results = super().pop(host)
+        self._index(host, results, -1)
+        return results
+
+    def popitem(self):
+        host, results = super().popitem()
+        self._index(host, results, -1)
+        return host, results
+
+    def setdefault(self, host, default=None):
+        if host not in self:
+            self[host] = default
+        return self[host]
+
+    def update(self, *args, **kwargs):
+        for host, results in dict(*args, **kwargs).items():
+            self[host] = results
+
+    def clear(self):
+        super().clear()
+        self.reindex()
+
+    def reindex(self):
+        """Rebuild the indexes of failed and changed hosts and severity levels"""
+        self._failed, self._changed, self._severities = {}, {}, Counter()
+        for host, results in self.items():
+            self._index(host, results, 1)
+
+    def _index(self, host, results, sign):
+        if self._severities is None:
+            self._failed, self._changed, self._severities = {}, {}, Counter()
+        if sign > 0:
+            if getattr(results, "failed", False):
+                self._failed[host] = results
+            if getattr(results, "changed", False):
+                self._changed[host] = results
+        else:
+            self._failed.pop(host, None)
+            self._changed.pop(host, None)
+        for level, count in _severity_counts(results).items():
+            self._severities[level] += sign * count
 
     def __repr__(self):
         return "{} ({}): {}".format(
@@ -210,14 +700,29 @@ class AggregatedResult(dict):
     @property
     def failed(self):
         """If ``True`` at least a host failed."""
-        return any([h.failed for h in self.values()])
+        return bool(self._failed)
 
     @property
     def failed_hosts(self):
         """Hosts that failed during the execution of the task."""
-        return {h: r for h, r in self.items() if r.failed}
+        return dict(self._failed)
+
+    @property
+    def changed_hosts(self):
+        """Hosts where the task changed the system."""
+        return dict(self._changed)
+
+    @property
+    def severity_counts(self):
+        """Number of results, including subtasks, with each severity level."""
+        return dict(+self._severities)
 
-    def raise_on_error(self):
+    @property
+    def skipped_hosts(self):
+        """Hosts that didn't run the task, see ``max_fail_percentage``."""
+        return {h: r for h, r in self.items() if getattr(r, "skipped", False)}
+
+    def raise_on_error(self) -> None:
         """
         Raises:
             :obj:`nornir.core.exceptions.NornirExecutionError`: When at least a task failed
@@ -225,36 +730,238 @@ class AggregatedResult(dict):
         if self.failed:
             raise NornirExecutionError(self)
 
+    def intern(self, store=None):
+        """
+        Replace the ``result``, ``stdout``, ``stderr`` and ``diff`` payloads of the
+        results that are identical to a payload already seen with a reference to
+        the same object so each distinct payload is kept in memory only once.
+
+        Arguments:
+            store (:obj:`nornir.core.intern.PayloadStore`): store to intern the
+              payloads into, for instance to share it across several executions.
+              Defaults to :attr:`payloads` or a new store if not set
+
+        Returns:
+            :obj:`nornir.core.intern.PayloadStore`: the store, its counters tell how
+            many distinct payloads were received
+        """
+        if store is None:
+            store = self.payloads if self.payloads is not None else PayloadStore()
+        for results in self.values():
+            if isinstance(results, MultiResult):
+                _intern_results(results, store)
+        self.payloads = store
+        return store
+
+    def archive(self):
+        """
+        Drop the references of the results to their hosts so they can be kept,
+        for instance in a history of executions, without keeping the hosts and
+        their connections alive. Results are still available by host name.
+        """
+        for results in self.values():
+            if isinstance(results, MultiResult):
+                _drop_hosts(results)
+
 
 class MultiResult(list):
     """
     It is basically is a list-like object that gives you access to the results of all subtasks for
     a particular device/task.
+
+    The number of results that failed, changed the system or have each severity
+    level is kept up to date as results are added and removed. Call
+    :meth:`reindex` if a result is modified after it's added.
     """
 
-    def __init__(self, name):
+    # see AggregatedResult, counters have to exist before __setstate__ is called
+    _failed = 0
+    _changed = 0
+    _severities = None
+
+    def __init__(self, name: str) -> None:
         self.name = name
+        self.reindex()
 
     def __getattr__(self, name):
+        if name.startswith("__"):
+            # avoid forwarding special methods looked up by pickle or copy
+            raise AttributeError(name)
         return getattr(self[0], name)
 
     def __repr__(self):
         return "{}: {}".format(self.__class__.__name__, super().__repr__())
 
+    def __getstate__(self):
+        return {k: v for k, v in self.__dict__.items() if k not in _INDEXES}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.reindex()
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            super().__setitem__(index, value)
+            self.reindex()
+            return
+        self._count(self[index], -1)
+        super().__setitem__(index, value)
+        self._count(value, 1)
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self.reindex()
+
+    def __iadd__(self, results):
+        self.extend(results)
+        return self
+
+    def __imul__(self, n):
+        super().__imul__(n)
+        self.reindex()
+        return self
+
+    def append(self, result: Union["Result", "MultiResult"]) -> None:
+        super().append(result)
+        self._count(result, 1)
+
+    def insert(self, index, result):
+        super().insert(index, result)
+        self._count(result, 1)
+
+    def extend(self, results):
+        results = list(results)
+        super().extend(results)
+        for r in results:
+            self._count(r, 1)
+
+    def pop(self, index=-1):
+        result = super().pop(index)
+        self._count(result, -1)
+        return result
+
+    def remove(self, result):
+        super().remove(result)
+        self._count(result, -1)
+
+    def clear(self):
+        super().clear()
+        self.reindex()
+
+    def reindex(self):
+        """Recount the results that failed, changed and their severity levels"""
+        self._failed, self._changed, self._severities = 0, 0, Counter()
+        for r in self:
+            self._count(r, 1)
+
+    def _count(self, result, sign):
+        if self._severities is None:
+            self._severities = Counter()
+        if result.failed:
+            self._failed += sign
+        if result.changed:
+            self._changed += sign
+        for level, count in _severity_counts(result).items():
+            self._severities[level] += sign * count
+
     @property
     def failed(self):
         """If ``True`` at least a task failed."""
-        return any([h.failed for h in self])
+        return self._failed > 0
 
     @property
     def changed(self):
         """If ``True`` at least a task changed the system."""
-        return any([h.changed for h in self])
+        return self._changed > 0
 
-    def raise_on_error(self):
+    @property
+    def severity_counts(self):
+        """Number of results, including nested ones, with each severity level."""
+        return dict(+self._severities)
+
+    def raise_on_error(self) -> None:
         """
         Raises:
             :obj:`nornir.core.exceptions.NornirExecutionError`: When at least a task failed
         """
         if self.failed:
             raise NornirExecutionError(self)
+
+
+_INDEXES = ("_failed", "_changed", "_severities")
+
+
+def _severity_counts(results):
+    if isinstance(results, MultiResult):
+        return results._severities or {}
+    level = getattr(results, "severity_level", None)
+    return {level: 1} if level is not None else {}
+
+
+def _picklable(value: Any) -> Any:
+    try:
+        pickle.dumps(value)
+        return value
+    except Exception:
+        if isinstance(value, BaseException):
+            return NornirRemoteError(value.__class__.__name__, str(value))
+        return repr(value)
+
+
+def _detach_results(results: "MultiResult") -> "MultiResult":
+    """
+    Prepare the results of a host to be sent to another process by removing
+    the references to the host and replacing the values that can't be pickled.
+    """
+    for r in results:
+        if isinstance(r, MultiResult):
+            _detach_results(r)
+            continue
+        r.host = None
+        for k, v in r.__getstate__().items():
+            setattr(r, k, _picklable(v))
+    return results
+
+
+def _copy_results(results):
+    """Shallow copy of ``results`` so their hosts can be changed."""
+    copied = MultiResult(results.name)
+    for r in results:
+        copied.append(_copy_results(r) if isinstance(r, MultiResult) else copy.copy(r))
+    return copied
+
+
+def _detached_copy(results: "MultiResult") -> "MultiResult":
+    """Same as :func:`_detach_results` but leaving ``results`` untouched."""
+    return _detach_results(_copy_results(results))
+
+
+def _drop_hosts(results):
+    for r in results:
+        if isinstance(r, MultiResult):
+            _drop_hosts(r)
+        else:
+            r.host = None
+    return results
+
+
+def _intern_results(results, store):
+    for r in results:
+        if isinstance(r, MultiResult):
+            _intern_results(r, store)
+            continue
+        for attr in ("result", "stdout", "stderr", "diff"):
+            value = getattr(r, attr, None)
+            if value is not None:
+                setattr(r, attr, store.intern(value))
+    return results
+
+
+def _attach_results(results: "MultiResult", host: Optional[Host]) -> "MultiResult":
+    """Revert :func:`_detach_results` once the results are received."""
+    for r in results:
+        if isinstance(r, MultiResult):
+            _attach_results(r, host)
+        else:
+            r.host = host
+    return results
@@ -1,5 +1,6 @@
 import logging
 import pprint
+import sys
 import threading
 from typing import List, Optional, cast
 from collections import OrderedDict
@@ -7,6 +8,8 @@ import json
 
 from colorama import Fore, Style, init
 
+from nornir.core.sink import ResultSummary
+from nornir.core.spill import SpilledText
 from nornir.core.task import AggregatedResult, MultiResult, Result
 
 
@@ -62,6 +65,10 @@ def _print_individual_result(
         if isinstance(x, BaseException):
             # for consistency between py3.6 and py3.7
             print(f"{x.__class__.__name__}{x.args}")
+        elif isinstance(x, SpilledText):
+            for chunk in x.chunks():
+                sys.stdout.write(chunk)
+            print()
         elif x and not isinstance(x, str):
             if isinstance(x, OrderedDict):
                 print(json.dumps(x, indent=2))
@@ -96,6 +103,8 @@ def _print_result(
                 "{}{}{}{}".format(Style.BRIGHT, Fore.BLUE, msg, "*" * (80 - len(msg)))
             )
             _print_result(host_data, host, attrs, failed, severity_level)
+    elif isinstance(result, ResultSummary):
+        _print_result(result.load(), host, attrs, failed, severity_level)
     elif isinstance(result, MultiResult):
         _print_individual_result(
             result[0], host, attrs, failed, severity_level, task_group=True
@@ -24,7 +24,14 @@ class Test(object):
     def test_config_defaults(self):
         c = ConfigDeserializer()
         assert c.dict() == {
-            "core": {"num_workers": 20, "raise_on_error": False},
+            "core": {
+                "num_workers": 20,
+                "num_processes": None,
+                "raise_on_error": False,
+                "durations_file": None,
+                "journal_file": "nornir_journal.db",
+                "spill_threshold": None,
+            },
             "inventory": {
                 "plugin": "nornir.plugins.inventory.simple.SimpleInventory",
                 "options": {},
@@ -67,7 +74,14 @@ class Test(object):
                 "loggers": ["nornir"],
             },
             "jinja2": {"filters": ""},
-            "core": {"num_workers": 30, "raise_on_error": False},
+            "core": {
+                "num_workers": 30,
+                "num_processes": None,
+                "raise_on_error": False,
+                "durations_file": None,
+                "journal_file": "nornir_journal.db",
+                "spill_threshold": None,
+            },
             "user_defined": {"my_opt": True},
         }
 
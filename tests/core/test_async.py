@@ -0,0 +1,128 @@
+import asyncio
+import collections
+import datetime
+import threading
+import time
+
+from nornir.core.exceptions import NornirExecutionError, NornirSubTaskError
+
+import pytest
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def async_task(task, wait=0):
+    await asyncio.sleep(wait)
+    return task.host.name
+
+
+async def async_failing_task(task):
+    raise Exception(task.host.name)
+
+
+def sync_task(task):
+    time.sleep(0.5)
+    return task.host.name
+
+
+async def async_grouped_task(task):
+    await task.run_async(async_task)
+    await task.run_async(sync_task)
+    return "done"
+
+
+def nested_sync_run(task):
+    nr = task.nornir.filter(name=task.host.name)
+    return nr.run(sync_task, num_workers=2)[task.host.name].result
+
+
+async def async_grouped_failing_task(task):
+    await task.run_async(async_failing_task)
+    return "I shouldn't be here"
+
+
+class Test(object):
+    def test_async_task(self, nornir):
+        t1 = datetime.datetime.now()
+        result = run(nornir.run_async(async_task, wait=1))
+        delta = datetime.datetime.now() - t1
+        assert delta.seconds == 1, delta
+        assert set(result.keys()) == set(nornir.inventory.hosts.keys())
+        for h, r in result.items():
+            assert not r.failed
+            assert r.result == h
+            assert r.name == "async_task"
+
+    def test_async_num_workers(self, nornir):
+        t1 = datetime.datetime.now()
+        run(nornir.run_async(async_task, wait=0.5, num_workers=1))
+        delta = datetime.datetime.now() - t1
+        assert delta.seconds == 2, delta
+
+    def test_sync_task(self, nornir):
+        t1 = datetime.datetime.now()
+        result = run(nornir.run_async(sync_task))
+        delta = datetime.datetime.now() - t1
+        assert delta.seconds == 0, delta
+        for h, r in result.items():
+            assert r.result == h
+
+    def test_sub_tasks(self, nornir):
+        result = run(nornir.run_async(async_grouped_task))
+        for h, r in result.items():
+            assert [sr.name for sr in r] == [
+                "async_grouped_task",
+                "async_task",
+                "sync_task",
+            ]
+            assert r[0].result == "done"
+            assert r[1].result == h
+            assert r[2].result == h
+
+    def test_failing_task(self, nornir):
+        result = run(nornir.run_async(async_failing_task))
+        assert result.failed
+        assert nornir.data.failed_hosts == set(nornir.inventory.hosts.keys())
+        for h, r in result.items():
+            assert isinstance(r.exception, Exception)
+            assert str(r.exception) == h
+
+    def test_failing_sub_task(self, nornir):
+        result = run(nornir.run_async(async_grouped_failing_task))
+        for h, r in result.items():
+            assert r[0].exception.__class__ is NornirSubTaskError
+            assert str(r[1].exception) == h
+
+    def test_raise_on_error(self, nornir):
+        with pytest.raises(NornirExecutionError):
+            run(nornir.run_async(async_failing_task, raise_on_error=True))
+
+    def test_same_hosts_as_submit(self, nornir):
+        lock = threading.Lock()
+        running = collections.Counter()
+        peak = collections.Counter()
+
+        def track(task):
+            name = task.host.name
+            with lock:
+                running[name] += 1
+                peak[name] = max(peak[name], running[name])
+            time.sleep(0.2)
+            with lock:
+                running[name] -= 1
+
+        handle = nornir.submit(track, num_workers=2)
+        result = run(nornir.run_async(track))
+        assert len(handle.result()) == len(result) == len(nornir.inventory.hosts)
+        assert peak == {h: 1 for h in nornir.inventory.hosts}
+
+    def test_nested_sync_run(self, nornir):
+        result = run(nornir.run_async(nested_sync_run))
+        for h, r in result.items():
+            assert r.result == h
@@ -0,0 +1,78 @@
+import collections
+import time
+
+from nornir.core.cache import ResultCache
+from nornir.core.task import MultiResult, Result
+
+
+RUNS = collections.Counter()
+
+
+def count_runs(task, fail_on=()):
+    RUNS[task.host.name] += 1
+    if task.host.name in fail_on:
+        raise Exception("failed")
+    return task.host.name
+
+
+def results_for(host, value):
+    results = MultiResult("my_task")
+    results.append(Result(host, result=value))
+    return results
+
+
+class Test(object):
+    def test_get_set(self, nornir, tmp_path):
+        host = nornir.inventory.hosts["dev1.group_1"]
+        path = str(tmp_path / "cache.db")
+        with ResultCache(path) as cache:
+            assert cache.get("dev1.group_1", "my_task", {"a": 1}) is None
+            cache.set("dev1.group_1", "my_task", {"a": 1}, results_for(host, 1))
+            assert cache.get("dev1.group_1", "my_task", {"a": 2}) is None
+            assert cache.get("dev1.group_1", "other_task", {"a": 1}) is None
+        with ResultCache(path) as cache:
+            cached = cache.get("dev1.group_1", "my_task", {"a": 1})
+            assert cached.result == 1
+            assert cached.host is None
+            cache.clear()
+            assert len(cache) == 0
+
+    def test_ttl(self, nornir):
+        host = nornir.inventory.hosts["dev1.group_1"]
+        cache = ResultCache(ttl=0.1)
+        cache.set("dev1.group_1", "my_task", {}, results_for(host, 1))
+        assert cache.get("dev1.group_1", "my_task", {}).result == 1
+        time.sleep(0.1)
+        assert cache.get("dev1.group_1", "my_task", {}) is None
+        assert len(cache) == 0
+
+    def test_lru(self, nornir):
+        host = nornir.inventory.hosts["dev1.group_1"]
+        cache = ResultCache(max_entries=2)
+        for i in range(2):
+            cache.set("dev1.group_1", "my_task", {"i": i}, results_for(host, i))
+        time.sleep(0.01)
+        assert cache.get("dev1.group_1", "my_task", {"i": 0}).result == 0
+        cache.set("dev1.group_1", "my_task", {"i": 2}, results_for(host, 2))
+        assert len(cache) == 2
+        assert cache.get("dev1.group_1", "my_task", {"i": 1}) is None
+        assert cache.get("dev1.group_1", "my_task", {"i": 0}).result == 0
+
+    def test_run(self, nornir):
+        RUNS.clear()
+        cache = ResultCache()
+        nornir.run(count_runs, cache=cache, fail_on=["dev2.group_1"])
+        assert len(cache) == len(nornir.inventory.hosts) - 1
+        nornir.data.reset_failed_hosts()
+
+        result = nornir.run(count_runs, cache=cache, fail_on=["dev2.group_1"])
+        assert sorted(result) == sorted(nornir.inventory.hosts)
+        assert RUNS["dev1.group_1"] == 1
+        assert RUNS["dev2.group_1"] == 2
+        for name, host in nornir.inventory.hosts.items():
+            assert result[name].host is host
+            assert result[name].result == name or result[name].failed
+        nornir.data.reset_failed_hosts()
+
+        nornir.run(count_runs, cache=cache, fail_on=[], num_workers=1)
+        assert RUNS["dev1.group_1"] == 2
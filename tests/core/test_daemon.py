@@ -0,0 +1,94 @@
+from nornir.core.connections import ConnectionPlugin, Connections
+from nornir.core.daemon import Daemon, DaemonClient
+from nornir.core.exceptions import NornirExecutionError
+
+import pytest
+
+
+AUTHKEY = b"nornir"
+
+
+class CountingConnection(ConnectionPlugin):
+    opened = 0
+
+    def open(self, *args, **kwargs):
+        CountingConnection.opened += 1
+        self.connection = True
+
+    def close(self):
+        self.connection = False
+
+
+def use_connection(task):
+    return id(task.host.get_connection("counting", task.nornir.config))
+
+
+def failing_task(task):
+    raise Exception(task.host.name)
+
+
+@pytest.fixture
+def daemon(nornir):
+    Connections.register("counting", CountingConnection)
+    d = Daemon(nornir, authkey=AUTHKEY)
+    yield d
+    d.close()
+    Connections.deregister("counting")
+
+
+class Test(object):
+    def test_run(self, daemon, nornir):
+        with DaemonClient(daemon.address, authkey=AUTHKEY) as client:
+            result = client.run(
+                "nornir.plugins.tasks.commands.command", command="echo hi"
+            )
+            assert result.name == "command"
+            assert sorted(result) == sorted(nornir.inventory.hosts)
+            assert not result.failed
+            assert result["dev1.group_1"].stdout == "hi\n"
+
+            result = client.run(failing_task, filters={"site": "site1"})
+            assert sorted(result) == ["dev1.group_1", "dev2.group_1"]
+            assert result.failed
+            assert not nornir.data.failed_hosts
+            with pytest.raises(NornirExecutionError):
+                client.run(failing_task, raise_on_error=True)
+
+    def test_warm_connections(self, daemon, nornir):
+        with DaemonClient(daemon.address, authkey=AUTHKEY) as client:
+            first = client.run(use_connection, num_workers=2)
+            second = client.run(use_connection)
+        assert {h: r.result for h, r in first.items()} == {
+            h: r.result for h, r in second.items()
+        }
+        assert CountingConnection.opened == len(nornir.inventory.hosts)
+        for host in nornir.inventory.hosts.values():
+            assert "counting" in host.connections
+
+    def test_run_iter(self, daemon, nornir):
+        with DaemonClient(daemon.address, authkey=AUTHKEY) as client:
+            for host, r in client.run_iter(use_connection):
+                break
+            assert host in nornir.inventory.hosts
+            assert len(client.run(use_connection)) == len(nornir.inventory.hosts)
+
+    def test_errors(self, daemon):
+        with DaemonClient(daemon.address, authkey=AUTHKEY) as client:
+            with pytest.raises(ModuleNotFoundError):
+                client.run("not_a_module.task")
+            with pytest.raises(ValueError):
+                client.run(use_connection, num_workers="many")
+            assert len(client.run(use_connection, filters={"site": "site2"})) == 2
+
+    def test_tcp(self, nornir):
+        with pytest.raises(ValueError):
+            Daemon(nornir, address=("localhost", 0))
+        with Daemon(nornir, address=("localhost", 0), authkey=AUTHKEY) as d:
+            with DaemonClient(d.address, authkey=AUTHKEY) as client:
+                result = client.run(
+                    "nornir.plugins.tasks.commands.command",
+                    filters={"site": "site1"},
+                    command="echo hi",
+                )
+                assert sorted(result) == ["dev1.group_1", "dev2.group_1"]
+                assert not result.failed
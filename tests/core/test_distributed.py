@@ -0,0 +1,138 @@
+import multiprocessing
+import os
+
+from nornir.core.distributed import Coordinator, worker
+from nornir.core.exceptions import NornirExecutionError
+
+import pytest
+
+
+dir_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+INVENTORY = {
+    "options": {
+        "host_file": "{}/inventory_data/hosts.yaml".format(dir_path),
+        "group_file": "{}/inventory_data/groups.yaml".format(dir_path),
+        "defaults_file": "{}/inventory_data/defaults.yaml".format(dir_path),
+    }
+}
+AUTHKEY = b"nornir"
+
+
+def get_pid(task):
+    return os.getpid()
+
+
+def failing_task(task):
+    raise Exception(task.host.name)
+
+
+def die_once(task, marker):
+    if task.host.name == "dev1.group_1" and not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return task.host.name
+
+
+def echo(task, value):
+    return value
+
+
+def unloadable():
+    raise ImportError("can't load the job")
+
+
+class Unloadable(object):
+    def __reduce__(self):
+        return unloadable, ()
+
+
+def start_workers(coordinator, num):
+    workers = []
+    for _ in range(num):
+        p = multiprocessing.Process(
+            target=worker,
+            args=(coordinator.address,),
+            kwargs={
+                "authkey": AUTHKEY,
+                "inventory": INVENTORY,
+                "logging": {"enabled": False},
+            },
+        )
+        p.start()
+        workers.append(p)
+    return workers
+
+
+@pytest.fixture
+def coordinator(nornir):
+    c = Coordinator(nornir, address=("localhost", 0), authkey=AUTHKEY, batch_size=1)
+    workers = start_workers(c, 2)
+    yield c
+    c.close()
+    for p in workers:
+        p.join(5)
+        assert not p.is_alive()
+
+
+class Test(object):
+    def test_run(self, nornir, coordinator):
+        result = coordinator.run(get_pid)
+        assert list(result.keys()) == list(nornir.inventory.hosts.keys())
+        for h, r in result.items():
+            assert not r.failed
+            assert r.host is nornir.inventory.hosts[h]
+            assert r.result != os.getpid()
+
+        result = coordinator.run(get_pid)
+        assert len(result) == len(nornir.inventory.hosts)
+
+    def test_run_failed(self, nornir, coordinator):
+        result = coordinator.run(failing_task)
+        assert result.failed
+        assert nornir.data.failed_hosts == set(nornir.inventory.hosts.keys())
+        for h, r in result.items():
+            assert str(r.exception) == h
+
+        with pytest.raises(NornirExecutionError):
+            coordinator.run(failing_task, on_failed=True, raise_on_error=True)
+
+    def test_worker_lost(self, nornir, coordinator, tmp_path):
+        marker = str(tmp_path / "marker")
+        result = coordinator.run(die_once, marker=marker)
+        assert os.path.exists(marker)
+        assert not result.failed
+        for h, r in result.items():
+            assert r.result == h
+
+    def test_job_error(self, nornir, tmp_path):
+        address = str(tmp_path / "nornir.sock")
+        with Coordinator(nornir, address=address, authkey=AUTHKEY) as c:
+            workers = start_workers(c, 1)
+            with pytest.raises(ImportError):
+                c.run(echo, value=Unloadable())
+            result = c.run(echo, value=1)
+            assert not result.failed
+        for p in workers:
+            p.join(5)
+            assert not p.is_alive()
+
+    def test_no_workers(self, nornir, tmp_path):
+        address = str(tmp_path / "nornir.sock")
+        with Coordinator(nornir, address=address, worker_timeout=0.1) as c:
+            with pytest.raises(TimeoutError):
+                c.run(get_pid)
+
+    def test_tcp_requires_authkey(self, nornir):
+        with pytest.raises(ValueError):
+            Coordinator(nornir, address=("localhost", 0))
+
+    def test_unix_socket(self, nornir, tmp_path):
+        address = str(tmp_path / "nornir.sock")
+        with Coordinator(nornir, address=address, authkey=AUTHKEY) as c:
+            workers = start_workers(c, 1)
+            result = c.run(get_pid)
+            assert len(result) == len(nornir.inventory.hosts)
+        for p in workers:
+            p.join(5)
+            assert not p.is_alive()
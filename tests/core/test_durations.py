@@ -0,0 +1,25 @@
+from nornir.core.durations import Durations
+
+
+class Test(object):
+    def test_record(self):
+        d = Durations()
+        assert d.get("task", "host") is None
+        d.record("task", "host", 2)
+        assert d.get("task", "host") == 2
+        d.record("task", "host", 4)
+        assert d.get("task", "host") == 3
+        assert d.get("other_task", "host") is None
+
+    def test_save(self, tmp_path):
+        path = str(tmp_path / "durations.json")
+        d = Durations(path)
+        d.record("task", "host", 2)
+        d.save()
+        assert Durations(path).get("task", "host") == 2
+
+    def test_load_invalid(self, tmp_path):
+        path = tmp_path / "durations.json"
+        path.write_text("not json")
+        d = Durations(str(path))
+        assert d.get("task", "host") is None
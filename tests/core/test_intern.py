@@ -0,0 +1,46 @@
+from nornir.core.intern import PayloadStore
+
+
+def show_version(task):
+    if task.host.get("site") == "site1":
+        return "Version 1.0\n" * 10
+    return "Version 2.0\n" * 10
+
+
+class Test(object):
+    def test_intern(self):
+        store = PayloadStore(min_size=4)
+        a = "".join(["abc", "def"])
+        b = "".join(["abc", "def"])
+        assert a is not b
+        assert store.intern(a) is a
+        assert store.intern(b) is a
+        assert store.intern(b"abcdef") == b"abcdef"
+        assert store.intern("abc") == "abc"
+        assert store.intern(1) == 1
+        assert len(store) == 2
+        assert store.total == 3
+        assert store.duplicates == 1
+        assert store.most_common(1) == [("abcdef", 2)]
+        assert sorted(store.counts().values()) == [1, 2]
+
+    def test_aggregated_result(self, nornir):
+        result = nornir.run(show_version)
+        store = result.intern()
+        assert result.payloads is store
+        assert len(store) == 2
+        assert store.total == 5
+        assert store.duplicates == 3
+        r1 = result["dev1.group_1"].result
+        assert result["dev2.group_1"].result is r1
+        assert result["dev3.group_2"].result is not r1
+        assert result["dev4.group_2"].result is result["dev5.no_group"].result
+
+    def test_run(self, nornir):
+        store = PayloadStore()
+        result = nornir.run(show_version, intern=store)
+        nornir.run(show_version, num_workers=1, intern=store)
+        assert result.payloads is store
+        assert result["dev1.group_1"].result is result["dev2.group_1"].result
+        assert len(store) == 2
+        assert store.total == 10
@@ -0,0 +1,82 @@
+import collections
+import threading
+
+from nornir.core.exceptions import NornirRemoteError
+from nornir.core.journal import Journal
+from nornir.core.task import MultiResult, Result
+
+import pytest
+
+
+class UnpicklableError(Exception):
+    def __init__(self, lock):
+        self.lock = lock
+        super().__init__("unpicklable")
+
+
+def count_runs(task, counter, fail_on=()):
+    counter[task.host.name] += 1
+    if task.host.name in fail_on:
+        raise UnpicklableError(threading.Lock())
+    return task.host.name
+
+
+def other_task(task):
+    pass
+
+
+@pytest.fixture
+def journal_file(nornir, tmp_path, monkeypatch):
+    path = str(tmp_path / "journal.db")
+    monkeypatch.setattr(nornir.config.core, "journal_file", path)
+    return path
+
+
+class Test(object):
+    def test_record(self, nornir, tmp_path):
+        host = nornir.inventory.hosts["dev1.group_1"]
+        results = MultiResult("my_task")
+        results.append(
+            Result(host, result=1, exception=UnpicklableError(threading.Lock()))
+        )
+        with Journal(str(tmp_path / "journal.db")) as journal:
+            journal.record("job", "my_task", results)
+            assert results[0].host is host
+
+            loaded = journal.load("job", "my_task")["dev1.group_1"]
+            assert loaded.result == 1
+            assert loaded.host is None
+            assert isinstance(loaded.exception, NornirRemoteError)
+            assert journal.load("other_job", "my_task") == {}
+            with pytest.raises(ValueError):
+                journal.load("job", "other_task")
+
+            journal.delete("job")
+            assert journal.load("job", "my_task") == {}
+
+    def test_resume(self, nornir, journal_file):
+        counter = collections.Counter()
+        nornir.filter(site="site1").run(
+            count_runs, counter=counter, fail_on=["dev1.group_1"], resume="job"
+        )
+        assert counter == {"dev1.group_1": 1, "dev2.group_1": 1}
+
+        result = nornir.run(count_runs, counter=counter, resume="job", on_failed=True)
+        assert sorted(result) == sorted(nornir.inventory.hosts)
+        assert counter == {h: 1 for h in nornir.inventory.hosts}
+        assert nornir.data.failed_hosts == {"dev1.group_1"}
+        assert isinstance(result["dev1.group_1"].exception, NornirRemoteError)
+        for name, host in nornir.inventory.hosts.items():
+            assert result[name].result == name or result[name].failed
+            assert result[name].host is host
+
+        result = nornir.run(
+            count_runs, counter=counter, resume="job", num_workers=2, on_failed=True
+        )
+        assert counter == {h: 1 for h in nornir.inventory.hosts}
+        assert len(result) == len(nornir.inventory.hosts)
+
+    def test_resume_different_task(self, nornir, journal_file):
+        nornir.run(other_task, resume="job")
+        with pytest.raises(ValueError):
+            nornir.run(count_runs, counter=collections.Counter(), resume="job")
@@ -1,12 +1,22 @@
+import collections
 import datetime
+import os
+import threading
 import time
 
-from nornir.core.exceptions import NornirExecutionError, CommandError
+from nornir.core.connections import ConnectionPlugin, Connections
+from nornir.core.durations import Durations
+from nornir.core.exceptions import (
+    CommandError,
+    NornirExecutionError,
+    NornirRemoteError,
+    NornirTimeoutError,
+)
+from nornir.core.pool import WorkerPool
 from nornir.plugins.tasks import commands
 
 import pytest
 
-
 NUM_WORKERS = 20
 
 
@@ -93,3 +103,655 @@ class Test(object):
     def test_change_data_in_thread(self, nornir):
         nornir.run(change_data, num_workers=NUM_WORKERS)
         nornir.run(verify_data_change, num_workers=NUM_WORKERS)
+
+    def test_run_iter_streams_results(self, nornir):
+        def wait_for_host(task):
+            if task.host.name == "dev1.group_1":
+                time.sleep(1)
+
+        t1 = datetime.datetime.now()
+        results = nornir.run_iter(wait_for_host, num_workers=NUM_WORKERS)
+        first = next(results)
+        delta = datetime.datetime.now() - t1
+        assert delta.seconds == 0, delta
+        assert first.host.name != "dev1.group_1"
+        hosts = {first.host.name} | {r.host.name for r in results}
+        assert hosts == set(nornir.inventory.hosts.keys())
+
+    def test_run_iter_failed_hosts(self, nornir):
+        results = list(nornir.run_iter(failing_task_simple, num_workers=NUM_WORKERS))
+        assert len(results) == len(nornir.inventory.hosts)
+        assert all(r.failed for r in results)
+        assert nornir.data.failed_hosts == set(nornir.inventory.hosts.keys())
+
+        results = list(nornir.run_iter(failing_task_simple, num_workers=1))
+        assert not results
+
+    def test_pool_is_shared(self, nornir):
+        def get_thread(task):
+            return threading.current_thread()
+
+        filtered = nornir.filter(site="site1")
+        assert filtered.pool is nornir.pool
+        r1 = nornir.run(get_thread, num_workers=NUM_WORKERS)
+        r2 = filtered.run(get_thread, num_workers=NUM_WORKERS)
+        threads = {r.result for r in r1.values()} | {r.result for r in r2.values()}
+        assert len(threads) <= len(nornir.inventory.hosts)
+        assert len(nornir.pool) <= NUM_WORKERS
+
+    def test_run_num_workers_limit(self, nornir):
+        t1 = datetime.datetime.now()
+        nornir.run(blocking_task, wait=0.5, num_workers=2)
+        delta = datetime.datetime.now() - t1
+        assert delta.seconds == 1, delta
+
+
+def get_pid(task):
+    task.host["pid"] = os.getpid()
+    return os.getpid()
+
+
+def failing_grouped_task(task):
+    task.run(failing_task_simple)
+
+
+class TestSharded(object):
+    def test_run_sharded(self, nornir):
+        result = nornir.run_sharded(get_pid, num_shards=2)
+        assert list(result.keys()) == list(nornir.inventory.hosts.keys())
+        pids = set()
+        for h, r in result.items():
+            assert not r.failed
+            assert r.host is nornir.inventory.hosts[h]
+            assert r.result != os.getpid()
+            pids.add(r.result)
+        assert 1 <= len(pids) <= 2
+        assert "pid" not in nornir.inventory.hosts["dev1.group_1"].data
+
+    def test_run_sharded_is_stable(self, nornir):
+        r1 = nornir.run_sharded(get_pid, num_shards=2)
+        r2 = nornir.run_sharded(get_pid, num_shards=2)
+        pids1 = {h: r.result for h, r in r1.items()}
+        pids2 = {h: r.result for h, r in r2.items()}
+        groups1 = {frozenset(h for h in pids1 if pids1[h] == p) for p in pids1.values()}
+        groups2 = {frozenset(h for h in pids2 if pids2[h] == p) for p in pids2.values()}
+        assert groups1 == groups2
+
+    def test_run_sharded_failed(self, nornir):
+        result = nornir.run_sharded(failing_grouped_task, num_shards=2)
+        assert result.failed
+        assert nornir.data.failed_hosts == set(nornir.inventory.hosts.keys())
+        for h, r in result.items():
+            assert r[0].host is nornir.inventory.hosts[h]
+            assert r[1].host is nornir.inventory.hosts[h]
+            assert r[0].exception.__class__ is NornirRemoteError
+            assert r[0].exception.exception_type == "NornirSubTaskError"
+            assert str(r[1].exception) == h
+
+    def test_run_sharded_raise_on_error(self, nornir):
+        with pytest.raises(NornirExecutionError):
+            nornir.run_sharded(failing_task_simple, num_shards=2, raise_on_error=True)
+
+    def test_run_sharded_durations(self, nornir, tmp_path):
+        path = str(tmp_path / "durations.json")
+        nr = nornir.filter()
+        nr.durations = Durations(path)
+        nr.run_sharded(get_pid, num_shards=2)
+        for h in nornir.inventory.hosts:
+            assert nr.durations.get("get_pid", h) is not None
+        assert Durations(path).get("get_pid", "dev1.group_1") is not None
+
+
+def pipeline_step(task, wait, fail_on=None):
+    if task.host.name == fail_on:
+        raise Exception(task.host.name)
+    time.sleep(wait.get(task.host.name, 0))
+    return datetime.datetime.now()
+
+
+class TestPipeline(object):
+    def test_run_pipeline(self, nornir):
+        # dev1 is slow in the first step and dev2 in the second one, with a barrier
+        # between steps the run would take 2 seconds
+        t1 = datetime.datetime.now()
+        results = nornir.run_pipeline(
+            [
+                (pipeline_step, {"wait": {"dev1.group_1": 1}, "name": "step1"}),
+                (pipeline_step, {"wait": {"dev2.group_1": 1}, "name": "step2"}),
+            ],
+            num_workers=NUM_WORKERS,
+        )
+        delta = datetime.datetime.now() - t1
+        assert delta.seconds == 1, delta
+        assert [r.name for r in results] == ["step1", "step2"]
+        for result in results:
+            assert list(result.keys()) == list(nornir.inventory.hosts.keys())
+            assert not result.failed
+        assert results[1]["dev3.group_2"].result < results[0]["dev1.group_1"].result
+
+    def test_run_pipeline_failed(self, nornir):
+        results = nornir.run_pipeline(
+            [
+                (pipeline_step, {"wait": {}, "fail_on": "dev1.group_1"}),
+                (pipeline_step, {"wait": {}, "fail_on": "dev2.group_1"}),
+                (blocking_task, {"wait": 0}),
+            ],
+            num_workers=NUM_WORKERS,
+        )
+        assert "dev1.group_1" in results[0]
+        assert "dev1.group_1" not in results[1]
+        assert "dev2.group_1" in results[1]
+        assert "dev2.group_1" not in results[2]
+        assert len(results[2]) == len(nornir.inventory.hosts) - 2
+        assert nornir.data.failed_hosts == {"dev1.group_1", "dev2.group_1"}
+
+    def test_run_pipeline_single_thread(self, nornir):
+        results = nornir.run_pipeline([change_data, verify_data_change], num_workers=1)
+        assert len(results) == 2
+        for result in results:
+            assert not result.failed
+            assert len(result) == len(nornir.inventory.hosts)
+
+    def test_run_pipeline_raise_on_error(self, nornir):
+        with pytest.raises(NornirExecutionError):
+            nornir.run_pipeline([failing_task_simple, change_data], raise_on_error=True)
+
+
+class TestConcurrencyLimits(object):
+    def test_concurrency_limits(self, nornir):
+        lock = threading.Lock()
+        running = collections.Counter()
+        peak = collections.Counter()
+
+        def track(task):
+            site = task.host.get("site")
+            with lock:
+                running[site] += 1
+                peak[site] = max(peak[site], running[site])
+            time.sleep(0.5)
+            with lock:
+                running[site] -= 1
+
+        t1 = datetime.datetime.now()
+        result = nornir.run(
+            track, num_workers=NUM_WORKERS, concurrency_limits={"site": 1}
+        )
+        delta = datetime.datetime.now() - t1
+        assert delta.seconds == 1, delta
+        assert not result.failed
+        assert len(result) == len(nornir.inventory.hosts)
+        assert peak == {"site1": 1, "site2": 1, None: 1}
+
+        peak.clear()
+        results = list(
+            nornir.run_iter(
+                track, num_workers=NUM_WORKERS, concurrency_limits={"site": 2}
+            )
+        )
+        assert len(results) == len(nornir.inventory.hosts)
+        assert peak == {"site1": 2, "site2": 2, None: 1}
+
+    def test_concurrency_limits_per_group(self, nornir):
+        lock = threading.Lock()
+        running = collections.Counter()
+        peak = collections.Counter()
+
+        def track(task):
+            groups = list(task.host.groups)
+            with lock:
+                running.update(groups)
+                peak.update({g: 0 for g in groups})
+                for g in groups:
+                    peak[g] = max(peak[g], running[g])
+            time.sleep(0.2)
+            with lock:
+                running.subtract(groups)
+
+        result = nornir.run(
+            track, num_workers=NUM_WORKERS, concurrency_limits={"groups": 1}
+        )
+        assert not result.failed
+        assert len(result) == len(nornir.inventory.hosts)
+        assert peak["group_1"] == peak["group_2"] == 1
+        assert set(peak.values()) == {1}
+
+    def test_concurrency_limits_invalid(self, nornir):
+        with pytest.raises(ValueError):
+            nornir.run(change_data, concurrency_limits={"site": 0})
+        with pytest.raises(ValueError):
+            nornir.run(change_data, concurrency_limits={"nested_data": 1})
+
+
+class DummyConnection(ConnectionPlugin):
+    def open(self, *args, **kwargs):
+        self.connection = True
+
+    def close(self):
+        self.connection = False
+
+
+class SlowConnection(DummyConnection):
+    def open(self, *args, **kwargs):
+        time.sleep(3)
+        self.connection = True
+
+
+def hang_with_connection(task, hang_on, wait):
+    task.host.get_connection("hang", task.nornir.config)
+    if task.host.name in hang_on:
+        time.sleep(wait)
+    return task.host.name
+
+
+class TestTimeouts(object):
+    @classmethod
+    def setup_class(cls):
+        Connections.register("hang", DummyConnection)
+        Connections.register("slow", SlowConnection)
+
+    @classmethod
+    def teardown_class(cls):
+        Connections.deregister("hang")
+        Connections.deregister("slow")
+
+    def test_task_timeout(self, nornir):
+        t1 = datetime.datetime.now()
+        result = nornir.run(
+            hang_with_connection,
+            hang_on=["dev1.group_1"],
+            wait=2,
+            task_timeout=0.5,
+            num_workers=NUM_WORKERS,
+        )
+        delta = datetime.datetime.now() - t1
+        assert delta.seconds == 0, delta
+        assert list(result.keys()) == list(nornir.inventory.hosts.keys())
+        assert nornir.data.failed_hosts == {"dev1.group_1"}
+        r = result["dev1.group_1"]
+        assert isinstance(r.exception, NornirTimeoutError)
+        assert r.exception.timeout == 0.5
+        assert r.name == "hang_with_connection"
+        # timed out hosts are closed in the background
+        for _ in range(100):
+            if "hang" not in nornir.inventory.hosts["dev1.group_1"].connections:
+                break
+            time.sleep(0.01)
+        assert "hang" not in nornir.inventory.hosts["dev1.group_1"].connections
+        assert "hang" in nornir.inventory.hosts["dev2.group_1"].connections
+        nornir.filter(name="dev2.group_1").close_connections()
+
+    def test_task_timeout_frees_workers(self, nornir):
+        hosts = list(nornir.inventory.hosts.keys())
+        t1 = datetime.datetime.now()
+        result = nornir.run(
+            hang_with_connection,
+            hang_on=hosts,
+            wait=2,
+            task_timeout=0.5,
+            num_workers=2,
+        )
+        delta = datetime.datetime.now() - t1
+        assert delta.seconds == 1, delta
+        assert len(result.failed_hosts) == len(hosts)
+
+        t1 = datetime.datetime.now()
+        result = nornir.run(
+            hang_with_connection, hang_on=[], wait=0, num_workers=2, on_failed=True
+        )
+        delta = datetime.datetime.now() - t1
+        assert delta.seconds == 0, delta
+        assert not result.failed
+        nornir.close_connections()
+
+    def test_task_timeout_while_opening(self, nornir):
+        def open_slow(task):
+            task.host.get_connection("slow", task.nornir.config)
+
+        t1 = datetime.datetime.now()
+        result = nornir.filter(name="dev1.group_1").run(
+            open_slow, task_timeout=0.5, num_workers=2
+        )
+        delta = datetime.datetime.now() - t1
+        assert delta.seconds == 0, delta
+        assert isinstance(result["dev1.group_1"].exception, NornirTimeoutError)
+
+        # the connection is closed once the plugin is done opening it
+        time.sleep(3)
+        assert "slow" not in nornir.inventory.hosts["dev1.group_1"].connections
+
+    def test_run_timeout(self, nornir):
+        t1 = datetime.datetime.now()
+        results = list(
+            nornir.run_iter(
+                hang_with_connection,
+                hang_on=list(nornir.inventory.hosts.keys()),
+                wait=1,
+                run_timeout=1.5,
+                num_workers=2,
+            )
+        )
+        delta = datetime.datetime.now() - t1
+        assert delta.seconds == 1, delta
+        assert len(results) == len(nornir.inventory.hosts)
+        messages = collections.Counter(
+            r.exception.message if r.failed else "ok" for r in results
+        )
+        assert messages == {
+            "ok": 2,
+            "run timed out": 2,
+            "run timed out before starting": 1,
+        }
+        nornir.close_connections(on_failed=True)
+
+
+def fail_on(task, names):
+    if task.host.name in names:
+        raise Exception(task.host.name)
+
+
+class TestBatches(object):
+    def test_batch_size(self, nornir):
+        lock = threading.Lock()
+        running = collections.Counter()
+        peak = collections.Counter()
+
+        def track(task):
+            with lock:
+                running["hosts"] += 1
+                peak["hosts"] = max(peak["hosts"], running["hosts"])
+            time.sleep(0.1)
+            with lock:
+                running["hosts"] -= 1
+
+        for batch in ({"batch_size": 2}, {"batch_percent": 40}):
+            peak.clear()
+            result = nornir.run(track, num_workers=NUM_WORKERS, **batch)
+            assert list(result.keys()) == list(nornir.inventory.hosts.keys())
+            assert not result.failed
+            assert not result.skipped_hosts
+            assert peak["hosts"] == 2
+
+    def test_max_fail_percentage(self, nornir):
+        result = nornir.run(
+            fail_on,
+            names=["dev1.group_1"],
+            num_workers=NUM_WORKERS,
+            batch_size=2,
+            max_fail_percentage=0,
+        )
+        assert list(result.keys()) == list(nornir.inventory.hosts.keys())
+        assert nornir.data.failed_hosts == {"dev1.group_1"}
+        assert not result["dev2.group_1"].failed
+        assert sorted(result.skipped_hosts) == [
+            "dev3.group_2",
+            "dev4.group_2",
+            "dev5.no_group",
+        ]
+        assert result["dev3.group_2"].name == "fail_on"
+
+    def test_max_fail_percentage_within_batch(self, nornir):
+        results = list(
+            nornir.run_iter(
+                fail_on,
+                names=["dev1.group_1", "dev2.group_1"],
+                num_workers=1,
+                max_fail_percentage=20,
+            )
+        )
+        assert [r.host.name for r in results] == list(nornir.inventory.hosts.keys())
+        assert [r.failed for r in results] == [True, True, False, False, False]
+        assert [getattr(r, "skipped", False) for r in results] == [
+            False,
+            False,
+            True,
+            True,
+            True,
+        ]
+        assert nornir.data.failed_hosts == {"dev1.group_1", "dev2.group_1"}
+
+    def test_batches_invalid(self, nornir):
+        with pytest.raises(ValueError):
+            nornir.run(change_data, batch_size=0)
+        with pytest.raises(ValueError):
+            nornir.run(change_data, batch_percent=150)
+        with pytest.raises(ValueError):
+            nornir.run(change_data, batch_size=2, batch_percent=10)
+
+
+class TestPriority(object):
+    def test_priority(self, nornir):
+        lock = threading.Lock()
+        started = []
+
+        def track(task, wait):
+            with lock:
+                started.append(task.host.name)
+            time.sleep(wait.get(task.host.name, 0))
+
+        nornir.run(track, wait={}, num_workers=1, priority=lambda h: h.name)
+        assert started == sorted(nornir.inventory.hosts.keys(), reverse=True)
+
+        wait = {"dev2.group_1": 0.3, "dev4.group_2": 0.2}
+        nornir.run(track, wait=wait, num_workers=NUM_WORKERS)
+        durations = nornir.durations
+        assert durations.get("track", "dev2.group_1") > durations.get(
+            "track", "dev4.group_2"
+        )
+
+        del started[:]
+        nornir.run(track, wait={}, num_workers=2)
+        assert started[:2] == ["dev2.group_1", "dev4.group_2"]
+
+
+class TestAutoscaling(object):
+    def test_num_workers_auto(self, nornir):
+        result = nornir.run(
+            blocking_task, wait=0.1, num_workers="auto", min_workers=2, max_workers=4
+        )
+        assert not result.failed
+        assert len(result) == len(nornir.inventory.hosts)
+        assert 2 <= result.stats["num_workers"] <= 4
+        assert result.stats["num_workers_history"][0] == 4
+
+        results = list(nornir.run_iter(blocking_task, wait=0, num_workers="auto"))
+        assert len(results) == len(nornir.inventory.hosts)
+
+    def test_num_workers_invalid(self, nornir):
+        with pytest.raises(ValueError):
+            nornir.run(change_data, num_workers="many")
+        with pytest.raises(ValueError):
+            nornir.run(change_data, num_workers="auto", min_workers=3, max_workers=2)
+
+
+def nested_run(task):
+    nr = task.nornir.filter(name=task.host.name)
+    return nr.run(verify_data_change, num_workers=2)[task.host.name].failed
+
+
+def nested_run_on_others(task):
+    nr = task.nornir.filter(filter_func=lambda h: h.name != task.host.name)
+    result = nr.run(blocking_task, wait=0.05, num_workers=2)
+    return sorted(result) if not result.failed else None
+
+
+class TestSubmit(object):
+    def test_submit(self, nornir):
+        t1 = datetime.datetime.now()
+        site1 = nornir.filter(site="site1").submit(
+            blocking_task, wait=0.5, num_workers=NUM_WORKERS
+        )
+        site2 = nornir.filter(site="site2").submit(
+            blocking_task, wait=0.5, num_workers=NUM_WORKERS
+        )
+        assert not site1.done()
+        assert sorted(site1.result()) == ["dev1.group_1", "dev2.group_1"]
+        assert sorted(site2.result()) == ["dev3.group_2", "dev4.group_2"]
+        delta = datetime.datetime.now() - t1
+        assert delta.seconds == 0, delta
+        assert site1.done()
+        assert not site1.cancel()
+        assert not site1.cancelled()
+
+    def test_submit_same_hosts(self, nornir):
+        lock = threading.Lock()
+        running = collections.Counter()
+        peak = collections.Counter()
+
+        def track(task):
+            with lock:
+                running[task.host.name] += 1
+                name = task.host.name
+                peak[name] = max(peak[name], running[name])
+            time.sleep(0.1)
+            with lock:
+                running[task.host.name] -= 1
+
+        handles = [nornir.submit(track, num_workers=NUM_WORKERS) for _ in range(3)]
+        handles.append(nornir.submit(track, num_workers=1))
+        for h in handles:
+            assert len(h.result()) == len(nornir.inventory.hosts)
+        assert peak == {h: 1 for h in nornir.inventory.hosts}
+
+    def test_submit_cancel(self, nornir):
+        handle = nornir.submit(blocking_task, wait=0.3, num_workers=1)
+        time.sleep(0.1)
+        assert handle.cancel()
+        result = handle.result()
+        assert handle.cancelled()
+        assert len(result) == len(nornir.inventory.hosts)
+        assert len(result.skipped_hosts) == len(nornir.inventory.hosts) - 1
+        assert not result.failed
+
+    def test_submit_raise_on_error(self, nornir):
+        handle = nornir.submit(failing_task_simple, raise_on_error=True)
+        with pytest.raises(NornirExecutionError):
+            handle.result()
+
+    def test_nested_run_on_same_host(self, nornir):
+        nornir.run(change_data, num_workers=1)
+        for num_workers in (1, NUM_WORKERS):
+            result = nornir.run(nested_run, num_workers=num_workers)
+            assert not result.failed
+            assert not any(r.result for r in result.values())
+
+    def test_nested_run_on_other_hosts(self, nornir):
+        handles = [nornir.submit(nested_run_on_others, num_workers=2) for _ in range(2)]
+        for handle in handles:
+            result = handle.result(timeout=10)
+            assert not result.failed
+            for name, r in result.items():
+                others = sorted(h for h in nornir.inventory.hosts if h != name)
+                assert r.result == others
+
+    def test_nested_run_with_busy_pool(self, nornir):
+        nr = nornir.filter()
+        nr.pool = WorkerPool(2)
+        try:
+            nr.run(change_data, num_workers=1)
+            result = nr.submit(nested_run, num_workers=2).result(timeout=10)
+            assert not result.failed
+            assert not any(r.result for r in result.values())
+        finally:
+            nr.pool.close()
+
+
+DEPENDENCIES = {
+    "dev3.group_2": ["group_1"],
+    "dev4.group_2": "group_1",
+    "dev5.no_group": ["dev3.group_2", "not_in_the_run"],
+}
+
+
+class TestDependencies(object):
+    def test_depends_on(self, nornir):
+        lock = threading.Lock()
+        events = []
+
+        def track(task):
+            with lock:
+                events.append(("start", task.host.name))
+            time.sleep(0.1)
+            with lock:
+                events.append(("end", task.host.name))
+
+        t1 = datetime.datetime.now()
+        result = nornir.run(
+            track,
+            num_workers=NUM_WORKERS,
+            depends_on=lambda h: DEPENDENCIES.get(h.name),
+        )
+        delta = datetime.datetime.now() - t1
+        assert delta.seconds == 0 and delta.microseconds < 500000, delta
+        assert not result.failed
+        assert not result.skipped_hosts
+        assert set(events[:2]) == {("start", "dev1.group_1"), ("start", "dev2.group_1")}
+        for name in ("dev3.group_2", "dev4.group_2"):
+            assert events.index(("start", name)) > events.index(("end", "dev1.group_1"))
+            assert events.index(("start", name)) > events.index(("end", "dev2.group_1"))
+        assert events.index(("start", "dev5.no_group")) > events.index(
+            ("end", "dev3.group_2")
+        )
+
+    def test_depends_on_group_data(self, nornir, monkeypatch):
+        data = nornir.inventory.groups["group_2"].data
+        monkeypatch.setitem(data, "depends_on", ["group_1"])
+        result = nornir.run(
+            fail_on, names=["dev1.group_1"], num_workers=1, depends_on="depends_on"
+        )
+        assert nornir.data.failed_hosts == {"dev1.group_1"}
+        assert sorted(result.skipped_hosts) == ["dev3.group_2", "dev4.group_2"]
+        assert result["dev3.group_2"].result == "skipped, dependency failed"
+        assert not result["dev5.no_group"].failed
+
+    def test_depends_on_failed_transitively(self, nornir):
+        results = list(
+            nornir.run_iter(
+                fail_on,
+                names=["dev2.group_1"],
+                num_workers=NUM_WORKERS,
+                depends_on=lambda h: DEPENDENCIES.get(h.name),
+            )
+        )
+        assert len(results) == len(nornir.inventory.hosts)
+        skipped = {r.host.name for r in results if getattr(r, "skipped", False)}
+        assert skipped == {"dev3.group_2", "dev4.group_2", "dev5.no_group"}
+
+    def test_depends_on_invalid(self, nornir):
+        cycle = {"dev1.group_1": ["dev5.no_group"], "dev5.no_group": ["group_1"]}
+        with pytest.raises(ValueError):
+            nornir.run(change_data, depends_on=lambda h: cycle.get(h.name))
+        with pytest.raises(ValueError):
+            nornir.run(change_data, depends_on="depends_on", batch_size=2)
+
+
+def count_calls(task, calls, fail=False):
+    calls.append(task.host.name)
+    if fail:
+        raise Exception("failed for {}".format(task.host.get("site")))
+    return task.host.get("site")
+
+
+class TestRunPer(object):
+    def test_run_per(self, nornir):
+        calls = []
+        result = nornir.run_per(count_calls, key="site", calls=calls)
+        assert sorted(calls) == ["dev1.group_1", "dev3.group_2", "dev5.no_group"]
+        assert list(result) == list(nornir.inventory.hosts)
+        for name, r in result.items():
+            assert r.host.name == name
+            assert r[0].host.name == name
+            assert r[0].result == nornir.inventory.hosts[name].get("site")
+        assert result["dev2.group_1"][0] is not result["dev1.group_1"][0]
+
+    def test_run_per_callable(self, nornir):
+        calls = []
+        nornir.run_per(count_calls, key=lambda h: "all", num_workers=1, calls=calls)
+        assert calls == ["dev1.group_1"]
+
+    def test_run_per_failed(self, nornir):
+        calls = []
+        result = nornir.run_per(count_calls, key="groups", calls=calls, fail=True)
+        assert len(calls) == 4
+        assert set(result.failed_hosts) == set(nornir.inventory.hosts)
+        assert set(nornir.data.failed_hosts) == set(nornir.inventory.hosts)
+        nornir.data.reset_failed_hosts()
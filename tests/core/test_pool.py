@@ -0,0 +1,101 @@
+import threading
+import time
+
+from nornir.core.pool import Autoscaler, WorkerPool
+
+import pytest
+
+
+def get_thread():
+    return threading.current_thread()
+
+
+def wait(t):
+    time.sleep(t)
+    return t
+
+
+class Test(object):
+    def test_submit(self):
+        pool = WorkerPool(2)
+        assert len(pool) == 0
+        assert pool.submit(wait, 0.1).result() == 0.1
+        assert len(pool) == 1
+        pool.close()
+
+    def test_exception(self):
+        pool = WorkerPool(2)
+        with pytest.raises(ZeroDivisionError):
+            pool.submit(lambda: 1 / 0).result()
+        pool.close()
+
+    def test_threads_are_reused(self):
+        pool = WorkerPool(2)
+        threads = {pool.submit(get_thread).result() for _ in range(10)}
+        assert len(threads) <= 2
+        assert len(pool) <= 2
+        pool.close()
+
+    def test_resize(self):
+        pool = WorkerPool(2)
+        futures = [pool.submit(wait, 0.1) for _ in range(4)]
+        assert [f.result() for f in futures] == [0.1] * 4
+        assert len(pool) == 2
+
+        pool.resize(4)
+        futures = [pool.submit(wait, 0.1) for _ in range(4)]
+        assert [f.result() for f in futures] == [0.1] * 4
+        assert len(pool) == 4
+
+        pool.resize(1)
+        time.sleep(0.1)
+        assert len(pool) == 1
+        assert pool.submit(wait, 0).result() == 0
+
+        with pytest.raises(ValueError):
+            pool.resize(0)
+        pool.close()
+
+    def test_close(self):
+        pool = WorkerPool(2)
+        future = pool.submit(wait, 0.2)
+        pool.close()
+        assert len(pool) == 0
+        assert future.result() == 0.2
+        assert pool.submit(wait, 0).result() == 0
+        assert len(pool) == 1
+        pool.close()
+
+
+class TestAutoscaler(object):
+    def test_grow(self):
+        scaler = Autoscaler(2, max_workers=10, max_cpu=100)
+        for _ in range(2 + 4 + 8):
+            scaler.observe(1, False)
+        assert scaler.history == [2, 4, 8, 10]
+
+    def test_shrink_on_errors(self):
+        scaler = Autoscaler(8, max_cpu=100)
+        for i in range(8):
+            scaler.observe(1, i == 0)
+        assert scaler.num_workers == 6
+        for _ in range(6 + 7):
+            scaler.observe(1, False)
+        assert scaler.history == [8, 6, 7, 8]
+
+    def test_shrink_on_latency(self):
+        scaler = Autoscaler(4, min_workers=3, max_cpu=100)
+        for _ in range(4):
+            scaler.observe(1, False)
+        for _ in range(8):
+            scaler.observe(3, False)
+        assert scaler.history == [4, 8, 6]
+        for _ in range(6):
+            scaler.observe(3, False)
+        for _ in range(4):
+            scaler.observe(3, False)
+        assert scaler.history == [4, 8, 6, 4, 3]
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            Autoscaler(2, min_workers=0)
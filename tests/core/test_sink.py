@@ -0,0 +1,80 @@
+import json
+
+from nornir.core.sink import JSONLSink, ResultSummary, SQLiteSink
+from nornir.core.task import Result
+from nornir.plugins.functions.text import print_result
+
+import pytest
+
+
+def big_output(task, fail_on=()):
+    if task.host.name in fail_on:
+        raise ValueError(task.host.name)
+    task.run(echo, name="echo")
+    return Result(host=task.host, result="x" * 1000, changed=True)
+
+
+def echo(task):
+    return task.host.name
+
+
+@pytest.fixture(params=["jsonl", "sqlite"])
+def sink(request, tmp_path):
+    if request.param == "jsonl":
+        s = JSONLSink(str(tmp_path / "results.jsonl"))
+    else:
+        s = SQLiteSink(str(tmp_path / "results.db"))
+    yield s
+    s.close()
+
+
+class Test(object):
+    def test_sink(self, nornir, sink):
+        result = nornir.run(big_output, fail_on=["dev2.group_1"], sink=sink)
+        assert sorted(result) == sorted(nornir.inventory.hosts)
+        assert set(result.failed_hosts) == {"dev2.group_1"}
+        assert nornir.data.failed_hosts == {"dev2.group_1"}
+        nornir.data.reset_failed_hosts()
+
+        for name, summary in result.items():
+            assert isinstance(summary, ResultSummary)
+            assert summary.host is nornir.inventory.hosts[name]
+            assert summary.name == "big_output"
+            loaded = summary.load()
+            assert loaded.name == "big_output"
+            assert all(r.host is summary.host for r in loaded)
+            if name == "dev2.group_1":
+                assert summary.failed and not summary.changed
+                assert loaded.failed
+                assert "ValueError" in loaded[0].result
+            else:
+                assert summary.changed and not summary.failed
+                assert [r.name for r in loaded] == ["big_output", "echo"]
+                assert loaded[0].result == "x" * 1000
+                assert loaded[1].result == name
+
+    def test_print_result(self, nornir, sink, capsys):
+        result = nornir.run(echo, sink=sink)
+        print_result(result)
+        out = capsys.readouterr().out
+        for name in nornir.inventory.hosts:
+            assert "* {}".format(name) in out
+            assert "\n{}\n".format(name) in out
+
+        print_result(result["dev1.group_1"])
+        assert "dev1.group_1" in capsys.readouterr().out
+
+    def test_sink_serial(self, nornir, sink):
+        result = nornir.run(echo, num_workers=1, sink=sink)
+        assert [s.load().result for s in result.values()] == list(
+            nornir.inventory.hosts
+        )
+
+    def test_jsonl_format(self, nornir, tmp_path):
+        path = str(tmp_path / "results.jsonl")
+        with JSONLSink(path) as sink:
+            nornir.run(echo, sink=sink)
+        with open(path) as f:
+            lines = [json.loads(line) for line in f]
+        assert sorted(line["host"] for line in lines) == sorted(nornir.inventory.hosts)
+        assert lines[0]["results"][0]["result"] == lines[0]["host"]
@@ -0,0 +1,106 @@
+import copy
+import os
+import pickle
+
+from nornir.core import spill
+from nornir.core.spill import SpilledText
+from nornir.core.task import Result
+from nornir.plugins.functions.text import print_result
+from nornir.plugins.tasks.files import write_file
+
+import pytest
+
+
+def long_output(task, size):
+    return Result(host=task.host, result="x" * size, diff="short")
+
+
+def backup(task, filename):
+    r = task.run(long_output, size=1000)
+    task.run(write_file, filename=filename, content=r.result, dry_run=False)
+
+
+@pytest.fixture
+def spill_threshold(nornir, monkeypatch):
+    monkeypatch.setattr(nornir.config.core, "spill_threshold", 100)
+
+
+class Test(object):
+    @pytest.mark.parametrize("text", ["hello\nworld\n" * 10, "héllo\nwörld €\n" * 10])
+    def test_spilled_text(self, text):
+        s = SpilledText(text)
+        assert str(s) == text
+        assert s == text
+        assert len(s) == len(text)
+        assert s[3] == text[3]
+        assert s[-1] == text[-1]
+        assert s[5:17] == text[5:17]
+        assert s[-20:] == text[-20:]
+        assert s[::3] == text[::3]
+        assert s[10:5] == ""
+        assert "".join(s) == text
+        assert list(s.lines()) == text.splitlines(True)
+        assert "".join(s.chunks(7)) == text
+        assert text[6:11] in s and "nope" not in s
+        assert s.splitlines() == text.splitlines()
+        assert s + "!" == text + "!"
+        assert hash(s) == hash(text)
+        with pytest.raises(IndexError):
+            s[len(text)]
+        assert pickle.loads(pickle.dumps(s)) == text
+        assert type(pickle.loads(pickle.dumps(s))) is str
+        assert copy.copy(s) is s
+        s.close()
+        with pytest.raises(ValueError):
+            str(s)
+
+    @pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs procfs")
+    def test_shared_file(self):
+        before = len(os.listdir("/proc/self/fd"))
+        texts = [SpilledText(str(i) * 100) for i in range(2000)]
+        assert len(os.listdir("/proc/self/fd")) <= before + 1
+        assert all(t == str(i) * 100 for i, t in enumerate(texts))
+
+    def test_spill_file_rotation(self, monkeypatch):
+        monkeypatch.setattr(spill, "_spill_file_size", 1000)
+        monkeypatch.setattr(spill, "_spill_file", None)
+        first = SpilledText("a" * 100)
+        store = first._store
+        texts = [SpilledText("b" * 500) for _ in range(4)]
+        assert texts[0]._store is store
+        assert texts[1]._store is store
+        assert texts[2]._store is not store
+        assert texts[2]._store is texts[3]._store
+
+        del texts
+        assert not store._file.closed
+        first.close()
+        assert store._file.closed
+
+    def test_contains_across_chunks(self):
+        text = "a" * ((1 << 20) - 2) + "needle" + "a" * 10
+        assert "needle" in SpilledText(text)
+
+    def test_spill_results(self, nornir, spill_threshold, capsys):
+        nr = nornir.filter(name="dev1.group_1")
+        r = nr.run(long_output, size=1000)["dev1.group_1"]
+        assert isinstance(r.result, SpilledText)
+        assert r.result == "x" * 1000
+        assert r.diff == "short"
+
+        print_result(r)
+        assert "x" * 1000 in capsys.readouterr().out
+
+        r = nr.run(long_output, size=100)["dev1.group_1"]
+        assert r.result == "x" * 100
+        assert isinstance(r.result, str)
+
+    def test_spill_once_host_is_done(self, nornir, spill_threshold, tmp_path):
+        filename = str(tmp_path / "backup")
+        nr = nornir.filter(name="dev1.group_1")
+        r = nr.run(backup, filename=filename)["dev1.group_1"]
+        assert not r.failed
+        with open(filename) as f:
+            assert f.read() == "x" * 1000
+        assert isinstance(r[1].result, SpilledText)
+        assert isinstance(r[2].diff, SpilledText)
@@ -1,9 +1,20 @@
+import collections
+import copy
+import datetime
+import itertools
 import logging
+import os
+import pickle
+import time
 
+from nornir.core.connections import ConnectionPlugin, Connections
 from nornir.core.exceptions import CommandError, NornirSubTaskError
+from nornir.core.task import AggregatedResult, MultiResult, Result, Retry
 
 from nornir.plugins.tasks import commands
 
+import pytest
+
 
 def a_task_to_test_dry_run(task, expected_dry_run_value, dry_run=None):
     assert task.is_dry_run(dry_run) is expected_dry_run_value
@@ -147,3 +158,318 @@ class Test(object):
         assert not r["dev1.group_1"][0].exception
         assert r["dev1.group_1"][0].result == "I captured this succcessfully"
         assert r["dev1.group_1"][1].exception.__class__ is CommandError
+
+
+def parse_in_process(host, text):
+    return {
+        "pid": os.getpid(),
+        "name": host.name,
+        "site": host["site"],
+        "connections": len(host.connections),
+        "words": len(text.split()),
+    }
+
+
+def fail_in_process(host):
+    raise ValueError(host.name)
+
+
+def task_run_in_process(task):
+    return task.run_in_process(parse_in_process, text="a b c").result
+
+
+def task_run_in_process_fails(task):
+    task.run_in_process(fail_in_process)
+
+
+class TestRunInProcess(object):
+    def test_run_in_process(self, nornir):
+        result = nornir.filter(site="site1").run(task_run_in_process)
+        assert result
+        for h, r in result.items():
+            assert not r.failed
+            assert r[1].name == "parse_in_process"
+            assert r[1].host is nornir.inventory.hosts[h]
+            assert r[1].result["pid"] != os.getpid()
+            assert r[1].result["name"] == h
+            assert r[1].result["site"] == "site1"
+            assert r[1].result["connections"] == 0
+            assert r[1].result["words"] == 3
+
+    def test_run_in_process_fails(self, nornir):
+        result = nornir.filter(name="dev1.group_1").run(task_run_in_process_fails)
+        r = result["dev1.group_1"]
+        assert r.failed
+        assert r[0].exception.__class__ is NornirSubTaskError
+        assert r[1].exception.__class__ is ValueError
+        assert str(r[1].exception) == "dev1.group_1"
+
+
+class SlowConnection(ConnectionPlugin):
+    opened = itertools.count()
+
+    def open(self, *args, **kwargs):
+        time.sleep(0.1)
+        self.connection = next(self.opened)
+
+    def close(self):
+        pass
+
+
+def sleep_and_connect(task, wait, fail=False):
+    time.sleep(wait)
+    if fail:
+        raise ValueError(task.host.name)
+    return task.host.get_connection("slow", task.nornir.config)
+
+
+def task_run_parallel(task, **kwargs):
+    r = task.run_parallel(
+        [
+            (sleep_and_connect, {"wait": 0.3, "name": "first"}),
+            (sleep_and_connect, {"wait": 0.2, "name": "second"}),
+            (sleep_and_connect, {"wait": 0.1, "name": "third"}),
+        ],
+        **kwargs,
+    )
+    return [x.result for x in r]
+
+
+def task_run_parallel_fails(task):
+    task.run_parallel(
+        [
+            (sleep_and_connect, {"wait": 0, "fail": True}),
+            (sleep_and_connect, {"wait": 0.1}),
+        ]
+    )
+
+
+class TestRunParallel(object):
+    @classmethod
+    def setup_class(cls):
+        Connections.register("slow", SlowConnection)
+
+    @classmethod
+    def teardown_class(cls):
+        Connections.deregister("slow")
+
+    def test_run_parallel(self, nornir):
+        nr = nornir.filter(name="dev1.group_1")
+        host = nr.inventory.hosts["dev1.group_1"]
+        t1 = datetime.datetime.now()
+        r = nr.run(task_run_parallel)["dev1.group_1"]
+        delta = datetime.datetime.now() - t1
+        assert delta.seconds == 0 and delta.microseconds < 600000, delta
+        assert not r.failed
+        assert [x.name for x in r] == ["task_run_parallel", "first", "second", "third"]
+        assert all(x.host is host for x in r)
+        first, second, third = r[0].result
+        assert first == host.connections["slow"].connection
+        assert len({first, second, third}) == 3
+        assert list(host.connections) == ["slow"]
+
+        r = nr.run(task_run_parallel, share_connections=True)["dev1.group_1"]
+        assert r[0].result == [first, first, first]
+        host.close_connections()
+
+    def test_run_parallel_shared_connection_opened_once(self, nornir):
+        nr = nornir.filter(name="dev1.group_1")
+        host = nr.inventory.hosts["dev1.group_1"]
+        r = nr.run(task_run_parallel, share_connections=True)["dev1.group_1"]
+        assert r[0].result == [host.connections["slow"].connection] * 3
+        host.close_connections()
+
+    def test_run_parallel_fails(self, nornir):
+        r = nornir.filter(name="dev1.group_1").run(task_run_parallel_fails)
+        r = r["dev1.group_1"]
+        assert r.failed
+        assert r[0].exception.__class__ is NornirSubTaskError
+        assert r[1].exception.__class__ is ValueError
+        assert not r[2].failed
+
+
+def flaky(task, calls, fail_times, exc=ConnectionResetError):
+    calls[task.host.name].append(task.host.get_connection("slow", task.nornir.config))
+    if len(calls[task.host.name]) <= fail_times:
+        raise exc(task.host.name)
+    return len(calls[task.host.name])
+
+
+def flaky_subtask(task, calls, fail_times):
+    task.run(commands.command, command="echo hi")
+    task.run(flaky, calls=calls, fail_times=fail_times)
+
+
+class TestRetry(object):
+    @classmethod
+    def setup_class(cls):
+        Connections.register("slow", SlowConnection)
+
+    @classmethod
+    def teardown_class(cls):
+        Connections.deregister("slow")
+
+    def test_retry(self, nornir):
+        nr = nornir.filter(site="site1")
+        calls = collections.defaultdict(list)
+        result = nr.run(flaky, calls=calls, fail_times=2, retry=Retry(backoff=0.01))
+        assert not result.failed
+        for name, r in result.items():
+            assert len(r) == 1
+            assert r.result == 3
+            assert len(set(calls[name])) == 3
+        nr.close_connections()
+
+    def test_retry_exhausted(self, nornir):
+        nr = nornir.filter(name="dev1.group_1")
+        calls = collections.defaultdict(list)
+        retry = Retry(attempts=2, backoff=0.01)
+        r = nr.run(flaky, calls=calls, fail_times=5, retry=retry)["dev1.group_1"]
+        assert r.failed
+        assert isinstance(r.exception, ConnectionResetError)
+        assert len(calls["dev1.group_1"]) == 2
+        nornir.data.reset_failed_hosts()
+        nr.close_connections(on_failed=True)
+
+    def test_retry_other_exception(self, nornir):
+        nr = nornir.filter(name="dev1.group_1")
+        calls = collections.defaultdict(list)
+        retry = Retry(backoff=0.01, exceptions=(ConnectionResetError,))
+        r = nr.run(flaky, calls=calls, fail_times=5, exc=ValueError, retry=retry)
+        assert r.failed
+        assert len(calls["dev1.group_1"]) == 1
+        nornir.data.reset_failed_hosts()
+        nr.close_connections(on_failed=True)
+
+    def test_retry_subtask(self, nornir):
+        nr = nornir.filter(name="dev1.group_1")
+        calls = collections.defaultdict(list)
+        retry = Retry(backoff=0.01, exceptions=(ConnectionResetError,))
+        r = nr.run(flaky_subtask, calls=calls, fail_times=1, retry=retry)
+        r = r["dev1.group_1"]
+        assert not r.failed
+        assert [x.name for x in r] == ["flaky_subtask", "command", "flaky"]
+        assert r[2].result == 2
+        nr.close_connections()
+
+    def test_delay(self):
+        retry = Retry(backoff=1, factor=2, max_backoff=3, jitter=0)
+        assert [retry.delay(i) for i in range(1, 5)] == [1, 2, 3, 3]
+        retry = Retry(backoff=1, jitter=0.5)
+        assert 1 <= retry.delay(1) <= 1.5
+        with pytest.raises(ValueError):
+            Retry(attempts=0)
+
+
+class TestResult(object):
+    def test_slots(self, nornir):
+        host = nornir.inventory.hosts["dev1.group_1"]
+        r = Result(host, result="ok")
+        assert not hasattr(r, "__dict__")
+        assert r._extras is None
+        assert r.stdout is None
+        with pytest.raises(AttributeError):
+            r.skipped
+
+        r = Result(host, result="ok", skipped=True)
+        r.custom = 1
+        assert r.skipped is True
+        assert r.custom == 1
+        assert getattr(r, "other", None) is None
+        del r.custom
+        assert not hasattr(r, "custom")
+
+    def test_copy_and_pickle(self, nornir):
+        r = Result(None, result="ok", changed=True, skipped=True)
+        r.name = "my_task"
+        for c in (copy.copy(r), pickle.loads(pickle.dumps(r))):
+            assert c.result == "ok"
+            assert c.changed is True
+            assert c.skipped is True
+            assert c.name == "my_task"
+            assert c._extras is not r._extras
+
+    def test_archive(self, nornir):
+        result = nornir.run(sub_task)
+        result.archive()
+        for name, r in result.items():
+            assert r.host is None
+            assert all(x.host is None for x in r)
+            assert r[1].result.strip() == name
+
+
+def make_result(failed=False, changed=False, severity_level=logging.INFO):
+    return Result(None, failed=failed, changed=changed, severity_level=severity_level)
+
+
+class TestIndexes(object):
+    def test_multi_result(self):
+        m = MultiResult("my_task")
+        assert not m.failed and not m.changed
+        ok = make_result()
+        m.append(ok)
+        m.insert(0, make_result(changed=True))
+        assert m.changed and not m.failed
+        m.extend([make_result(failed=True, severity_level=logging.ERROR)])
+        assert m.failed
+        assert m.severity_counts == {logging.INFO: 2, logging.ERROR: 1}
+
+        m.pop()
+        assert not m.failed
+        m[1] = make_result(failed=True)
+        assert m.failed
+        del m[1]
+        assert not m.failed
+        m.remove(m[0])
+        assert not m.changed
+        m += [make_result(changed=True)]
+        assert m.changed
+        m[:] = [ok]
+        assert not m.changed
+        assert m.severity_counts == {logging.INFO: 1}
+
+        nested = MultiResult("parent")
+        nested.append(make_result())
+        nested.append(MultiResult("empty"))
+        nested.append(m)
+        assert nested.severity_counts == {logging.INFO: 2}
+
+        m.append(make_result(failed=True, changed=True))
+        for c in (copy.copy(m), pickle.loads(pickle.dumps(m))):
+            assert c.failed and c.changed
+            assert c.severity_counts == {logging.INFO: 2}
+            c.clear()
+            assert not c.failed
+        assert m.failed
+
+    def test_aggregated_result(self, nornir):
+        result = nornir.run(task_fails_for_some)
+        nornir.data.reset_failed_hosts()
+        failed = {h: r for h, r in result.items() if r.failed}
+        assert failed
+        assert result.failed_hosts == failed
+        assert result.changed_hosts == {}
+        assert sum(result.severity_counts.values()) == sum(
+            len(r) for r in result.values()
+        )
+
+        for host in list(failed):
+            result[host] = result.pop(host)
+        assert result.failed_hosts == failed
+        for host in list(failed):
+            del result[host]
+        assert not result.failed
+        result.update(failed)
+        assert result.failed
+
+        m = MultiResult("my_task")
+        m.append(make_result(changed=True))
+        result["changed"] = m
+        assert list(result.changed_hosts) == ["changed"]
+        result["changed"] = MultiResult("my_task")
+        assert result.changed_hosts == {}
+
+        c = pickle.loads(pickle.dumps(AggregatedResult("my_task", a=m)))
+        assert list(c.changed_hosts) == ["a"]
+        c.clear()
+        assert c.changed_hosts == {}